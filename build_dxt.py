@@ -4,107 +4,232 @@ Build script to create a DXT (Desktop Extension) package from the main source co
 Dynamically discovers tools from handler definitions to avoid tight coupling.
 """
 
+import argparse
+import ast
+import io
 import os
-import shutil
 import zipfile
 import json
 import sys
+import functools
 import importlib.util
+import inspect
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from unittest.mock import MagicMock, patch
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+HANDLERS_DIR = Path("src/lifecycle_mcp/handlers")
+
+# Handler modules to inspect (excluding base_handler)
+HANDLER_MODULES = [
+    'requirement_handler',
+    'task_handler',
+    'architecture_handler',
+    'interview_handler',
+    'export_handler',
+    'status_handler'
+]
+
+# Already-compressed formats are stored as-is; deflating them again only burns CPU
+STORED_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".whl", ".zip", ".gz", ".db"}
+
+# The package is small and text-only, so spend the CPU on the best ratio
+TEXT_COMPRESSLEVEL = 9
+
+# Write buffer for the output archive
+ZIP_BUFFER_SIZE = 256 * 1024
+
+def _file_fingerprint(*paths: Path) -> Tuple[Tuple[str, int], ...]:
+    """Return (path, mtime_ns) pairs used to invalidate cached build inputs."""
+    fingerprint = []
+    for path in paths:
+        try:
+            fingerprint.append((str(path), path.stat().st_mtime_ns))
+        except OSError:
+            fingerprint.append((str(path), 0))
+    return tuple(fingerprint)
+
+def _import_handler_module(handler_name: str):
+    """
+    Load a handler module from its current file contents.
+
+    The handler itself is executed from a spec without being registered in
+    sys.modules; only the parent packages its relative imports need are.
+    Repeat builds are served by the fingerprinted _discover_tools_cached, so
+    this only runs again after a handler file has changed.
+    """
+    spec = importlib.util.spec_from_file_location(
+        f"lifecycle_mcp.handlers.{handler_name}", HANDLERS_DIR / f"{handler_name}.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _build_handler_args(handler_class: type, db_manager: Any) -> List[Any]:
+    """Build positional constructor arguments for a handler from its signature.
+
+    The database manager fills the first slot; every other required positional
+    parameter (e.g. InterviewHandler's requirement_handler) gets a MagicMock,
+    which auto-creates any attribute or call the constructor touches.
+    """
+    required = [
+        param for param in inspect.signature(handler_class).parameters.values()
+        if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD)
+        and param.default is param.empty
+    ]
+    return [db_manager] + [MagicMock(name=param.name) for param in required[1:]]
 
 def discover_tools_from_handlers() -> List[Dict[str, str]]:
     """
-    Dynamically discover tools by loading handler modules and extracting their tool definitions.
+    Dynamically discover tools by reading handler modules and extracting their tool definitions.
     This eliminates the need to hardcode tools in the build script.
+
+    Tool definitions are read statically from each handler's source; handlers are
+    only imported and instantiated when their definitions are not a plain literal.
+
+    Results are memoized on the handler files' modification times, so repeated
+    builds in the same process only re-inspect handlers after they change.
     """
-    tools = []
+    fingerprint = _file_fingerprint(*(HANDLERS_DIR / f"{name}.py" for name in HANDLER_MODULES))
+    # Hand out copies so callers cannot mutate the cached result
+    return [dict(tool) for tool in _discover_tools_cached(fingerprint)]
+
+def _handler_class_name(handler_name: str) -> str:
+    """Map a handler module name to its class name (task_handler -> TaskHandler)."""
+    return ''.join(word.capitalize() for word in handler_name.split('_'))
+
+def _module_constant(tree: ast.Module, name: str) -> Optional[ast.expr]:
+    """Return the value expression assigned to a module-level name, if any."""
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == name for t in node.targets):
+            return node.value
+        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name) and node.target.id == name:
+            return node.value
+    return None
+
+def _extract_tool_definitions_statically(handler_name: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Read a handler's tool definitions from its source without importing it.
+
+    Handlers return a literal list of dicts from get_tool_definitions(), either
+    inline or through a module-level constant, so the value can be evaluated
+    with ast.literal_eval. Returns None when
+    that is not possible and the handler has to be imported instead.
+    """
+    try:
+        tree = ast.parse((HANDLERS_DIR / f"{handler_name}.py").read_text())
+    except (OSError, SyntaxError):
+        return None
     
-    # Handler modules to inspect (excluding base_handler)
-    handler_modules = [
-        'requirement_handler',
-        'task_handler',
-        'architecture_handler',
-        'interview_handler',
-        'export_handler',
-        'status_handler'
-    ]
+    class_name = _handler_class_name(handler_name)
+    for node in tree.body:
+        if not (isinstance(node, ast.ClassDef) and node.name == class_name):
+            continue
+        for item in node.body:
+            if isinstance(item, ast.FunctionDef) and item.name == "get_tool_definitions":
+                returns = [n for n in ast.walk(item) if isinstance(n, ast.Return) and n.value is not None]
+                if len(returns) != 1:
+                    return None
+                value = returns[0].value
+                if isinstance(value, ast.Name):
+                    # Definitions hoisted into a module-level constant
+                    value = _module_constant(tree, value.id)
+                    if value is None:
+                        return None
+                try:
+                    tool_defs = ast.literal_eval(value)
+                except ValueError:
+                    return None
+                return tool_defs if isinstance(tool_defs, list) else None
+    return None
+
+def _load_tool_definitions_by_import(handler_names: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Instantiate handlers with a mocked database and ask them for their tools."""
+    tool_defs_by_handler = {}
     
-    # Add src directory to Python path temporarily
+    # Add src directory to Python path temporarily. patch.dict restores
+    # sys.modules on exit, dropping the mock database module and the packages
+    # pulled in by relative imports without disturbing anything loaded before.
     src_path = Path("src").absolute()
     sys.path.insert(0, str(src_path))
     
     try:
-        # Import lifecycle_mcp as a package to set up proper module structure
-        import lifecycle_mcp
-        
-        # Mock the dependencies to avoid initialization issues
-        class MockDatabaseManager:
-            pass
-        
-        # Set up the mocks in the lifecycle_mcp namespace
-        sys.modules['lifecycle_mcp.database_manager'] = type(sys)('mock_db')
-        sys.modules['lifecycle_mcp.database_manager'].DatabaseManager = MockDatabaseManager
-        
-        for handler_name in handler_modules:
-            try:
-                # Import handler using proper module path
-                module_name = f"lifecycle_mcp.handlers.{handler_name}"
-                handler_module = importlib.import_module(module_name)
-                
-                # Find the handler class (should be named like RequirementHandler, TaskHandler, etc.)
-                handler_class_name = ''.join(word.capitalize() for word in handler_name.split('_'))
-                handler_class = getattr(handler_module, handler_class_name, None)
-                
-                if handler_class:
-                    # Create instance with mock database manager
-                    # Note: Some handlers might require additional parameters
-                    handler_instance = None
+        with patch.dict(sys.modules):
+            # Mock the database module so handler imports and __init__ bodies that
+            # touch the database succeed without opening a connection
+            sys.modules['lifecycle_mcp.database_manager'] = MagicMock(name="lifecycle_mcp.database_manager")
+            
+            for handler_name in handler_names:
+                try:
+                    handler_module = _import_handler_module(handler_name)
                     
-                    try:
-                        # Try with just db_manager
-                        handler_instance = handler_class(MockDatabaseManager())
-                    except TypeError:
-                        try:
-                            # Try with db_manager and None for mcp_client
-                            handler_instance = handler_class(MockDatabaseManager(), None)
-                        except TypeError:
-                            # Special case for InterviewHandler which needs requirement_handler
-                            if handler_name == 'interview_handler':
-                                # Create a mock requirement handler
-                                mock_req_handler = type('MockReqHandler', (), {'__init__': lambda s, *a: None})()
-                                handler_instance = handler_class(MockDatabaseManager(), mock_req_handler)
-                            else:
-                                print(f"Warning: Could not instantiate {handler_class_name}, skipping...")
-                                continue
+                    # Find the handler class (should be named like RequirementHandler, TaskHandler, etc.)
+                    handler_class = getattr(handler_module, _handler_class_name(handler_name), None)
                     
-                    # Get tool definitions
-                    if handler_instance and hasattr(handler_instance, 'get_tool_definitions'):
-                        tool_defs = handler_instance.get_tool_definitions()
+                    if handler_class:
+                        # Create instance with mock database manager; any further
+                        # required constructor arguments are filled with mocks
+                        handler_instance = handler_class(*_build_handler_args(handler_class, MagicMock(name="db_manager")))
                         
-                        # Extract just name and description for manifest
-                        for tool_def in tool_defs:
-                            tools.append({
-                                "name": tool_def.get("name"),
-                                "description": tool_def.get("description")
-                            })
-                    
-            except Exception as e:
-                print(f"Warning: Could not process {handler_name}: {e}")
-                # Continue with other handlers
+                        # Get tool definitions
+                        if handler_instance and hasattr(handler_instance, 'get_tool_definitions'):
+                            tool_defs_by_handler[handler_name] = handler_instance.get_tool_definitions()
+                        
+                except Exception as e:
+                    print(f"Warning: Could not process {handler_name}: {e}")
+                    # Continue with other handlers
     
     finally:
-        # Clean up: remove from path and modules
-        sys.path.pop(0)
-        # Remove mock modules
-        for key in list(sys.modules.keys()):
-            if key.startswith('lifecycle_mcp'):
-                del sys.modules[key]
+        sys.path.remove(str(src_path))
+    
+    return tool_defs_by_handler
+
+def _intern(value: Any) -> Any:
+    """Intern string values so duplicate descriptions are stored once."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+@functools.lru_cache(maxsize=1)
+def _discover_tools_cached(fingerprint: Tuple[Tuple[str, int], ...]) -> Tuple[Dict[str, str], ...]:
+    """Inspect handler modules; cached per handler fingerprint."""
+    # Static extraction has no shared state, so handlers are parsed concurrently
+    with ThreadPoolExecutor(max_workers=len(HANDLER_MODULES)) as executor:
+        extracted = list(executor.map(_extract_tool_definitions_statically, HANDLER_MODULES))
+    
+    tool_defs_by_handler = {}
+    needs_import = []
+    for handler_name, tool_defs in zip(HANDLER_MODULES, extracted):
+        if tool_defs is None:
+            needs_import.append(handler_name)
+        else:
+            tool_defs_by_handler[handler_name] = tool_defs
+    
+    # Only fall back to importing handlers whose definitions are not literal
+    if needs_import:
+        tool_defs_by_handler.update(_load_tool_definitions_by_import(needs_import))
     
-    return tools
+    # Extract just name and description for manifest; repeated descriptions share one string
+    return tuple(
+        {
+            "name": tool_def.get("name"),
+            "description": _intern(tool_def.get("description")),
+        }
+        for handler_name in HANDLER_MODULES
+        for tool_def in tool_defs_by_handler.get(handler_name, [])
+    )
 
 def get_project_metadata() -> Dict[str, Any]:
     """Extract project metadata from pyproject.toml if available."""
+    return dict(_get_project_metadata_cached(_file_fingerprint(Path("pyproject.toml"))))
+
+@functools.lru_cache(maxsize=1)
+def _get_project_metadata_cached(fingerprint: Tuple[Tuple[str, int], ...]) -> Dict[str, Any]:
+    """Parse pyproject.toml; cached until the file changes."""
     metadata = {
         "version": "1.0.0",
         "description": "Software lifecycle management MCP server for tracking requirements, tasks, and architecture decisions",
@@ -139,9 +264,10 @@ def get_project_metadata() -> Dict[str, Any]:
     
     return metadata
 
-def create_dxt_manifest() -> Dict[str, Any]:
+def create_dxt_manifest(metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Create the manifest.json for the DXT package with dynamically discovered tools."""
-    metadata = get_project_metadata()
+    if metadata is None:
+        metadata = get_project_metadata()
     
     # Discover tools dynamically
     print("Discovering tools from handler definitions...")
@@ -183,38 +309,60 @@ def create_dxt_manifest() -> Dict[str, Any]:
     
     return manifest
 
-def build_dxt():
-    """Build the DXT package"""
+def _dumps_manifest(manifest: Dict[str, Any]) -> bytes:
+    """Serialize the manifest as indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(manifest, option=orjson.OPT_INDENT_2)
+    return json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8")
+
+def _iter_package_files(root: str, prefix: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (path, arcname) for every file to ship under root, depth first in name order.
+
+    Uses os.scandir so directory entries come with cached type information and
+    archive names are built by string concatenation rather than Path.relative_to.
+    """
+    with os.scandir(root) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    for entry in entries:
+        arcname = f"{prefix}/{entry.name}"
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name == "__pycache__" or entry.name.endswith(".egg-info"):
+                continue
+            yield from _iter_package_files(entry.path, arcname)
+        elif entry.is_file() and not entry.name.endswith(".pyc"):
+            yield entry.path, arcname
+
+def _compression_for(name: str, compress: bool = True) -> Tuple[int, Optional[int]]:
+    """Pick the zip compression method and level for an archive entry."""
+    if not compress or os.path.splitext(name)[1].lower() in STORED_SUFFIXES:
+        return zipfile.ZIP_STORED, None
+    return zipfile.ZIP_DEFLATED, TEXT_COMPRESSLEVEL
+
+def _write_file(zf: zipfile.ZipFile, path: str, arcname: str, compress: bool = True) -> None:
+    """Add a file from disk to the archive using its per-entry compression."""
+    compress_type, compresslevel = _compression_for(path, compress)
+    zf.write(path, arcname, compress_type=compress_type, compresslevel=compresslevel)
+
+def build_dxt(compress: bool = True):
+    """Build the DXT package
+
+    Args:
+        compress: Deflate text entries. Developer builds can pass False to
+            store every entry uncompressed, which writes at raw disk speed.
+    """
     print("Building DXT package for lifecycle-mcp...")
+    metadata = get_project_metadata()
     
-    # Create build directory
-    build_dir = Path("build/dxt")
-    if build_dir.exists():
-        shutil.rmtree(build_dir)
-    build_dir.mkdir(parents=True)
-    
-    # Copy source files
-    src_dir = Path("src/lifecycle_mcp")
-    dest_dir = build_dir / "lifecycle_mcp"
-    print(f"Copying source from {src_dir} to {dest_dir}...")
-    shutil.copytree(src_dir, dest_dir, ignore=shutil.ignore_patterns("__pycache__", "*.pyc", "*.egg-info"))
-    
-    # Copy server.py to the root of the package
-    if Path("server.py").exists():
-        shutil.copy("server.py", build_dir / "server.py")
-    
-    # Create manifest.json
-    manifest_path = build_dir / "manifest.json"
+    # Build the manifest up front so every entry can be streamed into the archive
     print("Creating manifest.json...")
     try:
-        manifest = create_dxt_manifest()
-        with open(manifest_path, "w") as f:
-            json.dump(manifest, f, indent=2)
+        manifest = create_dxt_manifest(metadata)
     except Exception as e:
         print(f"Error creating manifest: {e}")
         print("Falling back to minimal manifest...")
         # Create a minimal manifest as fallback
-        minimal_manifest = {
+        manifest = {
             "dxt_version": "0.1",
             "name": "lifecycle-mcp",
             "version": "1.0.0",
@@ -226,8 +374,6 @@ def build_dxt():
             },
             "tools": []  # Empty tools list as fallback
         }
-        with open(manifest_path, "w") as f:
-            json.dump(minimal_manifest, f, indent=2)
     
     # Create a minimal setup.py for the DXT
     setup_content = """from setuptools import setup, find_packages
@@ -243,67 +389,73 @@ setup(
     }
 )
 """
-    with open(build_dir / "setup.py", "w") as f:
-        f.write(setup_content)
-    
-    # Copy README
-    if Path("README.md").exists():
-        shutil.copy("README.md", build_dir / "README.md")
-    
-    # Copy pyproject.toml
-    if Path("pyproject.toml").exists():
-        shutil.copy("pyproject.toml", build_dir / "pyproject.toml")
-    
-    # Create requirements.txt
-    with open(build_dir / "requirements.txt", "w") as f:
-        f.write("mcp>=1.0.0\n")
     
-    # Create the DXT zip file
-    # Extract version from metadata for filename
-    metadata = get_project_metadata()
+    # Create the DXT zip file, writing sources straight from the tree
+    # instead of staging them in a build directory first
     dxt_filename = f"lifecycle-mcp-{metadata['version']}.dxt"
     dxt_path = Path(dxt_filename)
     
+    src_dir = Path("src/lifecycle_mcp")
+    
     print(f"Creating {dxt_filename}...")
-    with zipfile.ZipFile(dxt_path, "w", zipfile.ZIP_DEFLATED) as zf:
-        # Walk through build directory and add all files
-        for root, dirs, files in os.walk(build_dir):
-            for file in files:
-                file_path = Path(root) / file
-                arcname = file_path.relative_to(build_dir)
-                zf.write(file_path, arcname)
+    # Entries written with writestr use the archive defaults
+    default_type, default_level = _compression_for(dxt_filename, compress)
     
-    # Clean up build directory
-    shutil.rmtree(build_dir)
+    # Coalesce the many small header/data writes zipfile issues into large ones
+    with open(dxt_path, "wb", buffering=0) as raw, \
+            io.BufferedWriter(raw, buffer_size=ZIP_BUFFER_SIZE) as buffered, \
+            zipfile.ZipFile(buffered, "w", default_type, compresslevel=default_level) as zf:
+        print(f"Adding source from {src_dir}...")
+        for file_path, arcname in _iter_package_files(str(src_dir), src_dir.name):
+            _write_file(zf, file_path, arcname, compress)
+        
+        # Copy server.py, README and pyproject.toml to the root of the package
+        for extra_file in ("server.py", "README.md", "pyproject.toml"):
+            if Path(extra_file).exists():
+                _write_file(zf, extra_file, extra_file, compress)
+        
+        zf.writestr("manifest.json", _dumps_manifest(manifest))
+        zf.writestr("setup.py", setup_content)
+        zf.writestr("requirements.txt", "mcp>=1.0.0\n")
+        
+        # Record what was written while the central directory is still in memory
+        files = zf.namelist()
     
     print(f"✅ DXT package created: {dxt_path}")
     print(f"   Size: {dxt_path.stat().st_size / 1024:.1f} KB")
     
-    # Verify the package
+    # Summarize the package from what was written rather than re-reading the archive
     print("\nVerifying package contents:")
-    with zipfile.ZipFile(dxt_path, "r") as zf:
-        files = zf.namelist()
-        print(f"   Files in package: {len(files)}")
-        for f in sorted(files)[:10]:
-            print(f"   - {f}")
-        if len(files) > 10:
-            print(f"   ... and {len(files) - 10} more files")
-        
-        # Show tools discovered
-        try:
-            manifest_data = json.loads(zf.read("manifest.json"))
-            tools = manifest_data.get("tools", [])
-            print(f"\n   Tools in manifest: {len(tools)}")
-            for i, tool in enumerate(tools[:5]):
-                print(f"   - {tool['name']}: {tool['description']}")
-            if len(tools) > 5:
-                print(f"   ... and {len(tools) - 5} more tools")
-        except Exception as e:
-            print(f"   Could not read tools from manifest: {e}")
+    print(f"   Files in package: {len(files)}")
+    for f in sorted(files)[:10]:
+        print(f"   - {f}")
+    if len(files) > 10:
+        print(f"   ... and {len(files) - 10} more files")
+    
+    # Show tools discovered
+    tools = manifest.get("tools", [])
+    print(f"\n   Tools in manifest: {len(tools)}")
+    for tool in tools[:5]:
+        print(f"   - {tool['name']}: {tool['description']}")
+    if len(tools) > 5:
+        print(f"   ... and {len(tools) - 5} more tools")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options for the build script."""
+    parser = argparse.ArgumentParser(description="Build the lifecycle-mcp DXT package")
+    parser.add_argument(
+        "--compress",
+        action=argparse.BooleanOptionalAction,
+        # DXT_FAST=1 makes uncompressed developer builds the default
+        default=os.environ.get("DXT_FAST") != "1",
+        help="Deflate package entries (use --no-compress or DXT_FAST=1 for fast developer builds)",
+    )
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
+    args = parse_args()
     try:
-        build_dxt()
+        build_dxt(compress=args.compress)
     except Exception as e:
         print(f"❌ Error building DXT: {e}")
         sys.exit(1)
\ No newline at end of file
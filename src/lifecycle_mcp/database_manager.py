@@ -4,32 +4,137 @@ Database Manager for Lifecycle MCP Server
 Provides centralized database connection and operation management
 """
 
+import functools
+import itertools
 import logging
 import os
 import sqlite3
+import sys
 import threading
 import time
+import weakref
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager, suppress
+from operator import itemgetter
 from pathlib import Path
-from queue import Empty, Full, Queue
 from typing import Any
 
-from .migrations import apply_all_migrations
+from .migrations import LATEST_SCHEMA_VERSION, apply_all_migrations
 
 logger = logging.getLogger(__name__)
 
+# Extended result code for a WAL read snapshot that cannot be upgraded to a write
+SQLITE_BUSY_SNAPSHOT = 517
+
+# Prepared statements kept per connection; the stdlib default of 128 is easily
+# exhausted by the generated INSERT/UPDATE/SELECT shapes across all tables
+STATEMENT_CACHE_SIZE = 512
+
+
+@functools.lru_cache(maxsize=256)
+def _build_insert_sql(table: str, columns: tuple[str, ...]) -> str:
+    """Build (and cache) an INSERT statement for a column shape"""
+    placeholders = ", ".join("?" for _ in columns)
+    return sys.intern(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})")
+
+
+@functools.lru_cache(maxsize=256)
+def _build_update_sql(table: str, columns: tuple[str, ...], where_clause: str) -> str:
+    """Build (and cache) an UPDATE statement for a column shape"""
+    set_clauses = ", ".join(f"{column} = ?" for column in columns)
+    return sys.intern(f"UPDATE {table} SET {set_clauses} WHERE {where_clause}")
+
+
+@functools.lru_cache(maxsize=256)
+def _build_delete_sql(table: str, where_clause: str) -> str:
+    """Build (and cache) a DELETE statement"""
+    return sys.intern(f"DELETE FROM {table} WHERE {where_clause}")
+
+
+@functools.lru_cache(maxsize=256)
+def _build_select_sql(
+    table: str, columns: str, where_clause: str, order_by: str, has_limit: bool, has_offset: bool = False
+) -> str:
+    """Build (and cache) a SELECT statement; LIMIT and OFFSET values are bound as parameters"""
+    query = f"SELECT {columns} FROM {table}"
+
+    if where_clause:
+        query += f" WHERE {where_clause}"
+
+    if order_by:
+        query += f" ORDER BY {order_by}"
+
+    if has_limit:
+        query += " LIMIT ?"
+    elif has_offset:
+        # SQLite only accepts OFFSET after a LIMIT clause
+        query += " LIMIT -1"
+
+    if has_offset:
+        query += " OFFSET ?"
+
+    return sys.intern(query)
+
+
+@functools.lru_cache(maxsize=256)
+def _build_exists_sql(table: str, where_clause: str) -> str:
+    """Build (and cache) an EXISTS probe returning a single 0/1 column"""
+    return sys.intern(f"SELECT EXISTS(SELECT 1 FROM {table} WHERE {where_clause})")
+
+
+@functools.lru_cache(maxsize=256)
+def _build_next_id_sql(table: str, id_column: str, where_clause: str) -> str:
+    """Build (and cache) the MAX() + 1 probe used to allocate the next number"""
+    query = f"SELECT COALESCE(MAX({id_column}), 0) + 1 FROM {table}"
+    if where_clause:
+        query += f" WHERE {where_clause}"
+    return sys.intern(query)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_schema_sql() -> str:
+    """Read (and cache) the bundled schema script"""
+    schema_path = Path(__file__).parent / "lifecycle-schema.sql"
+    if not schema_path.exists():
+        logger.error(f"Schema file not found at {schema_path}")
+        raise FileNotFoundError(f"Schema file not found at {schema_path}")
+    return schema_path.read_text(encoding="utf-8")
+
 
 class ConnectionPool:
     """Thread-safe SQLite connection pool"""
 
+    # Per-connection settings applied to every new connection
+    CONNECTION_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",  # Write-Ahead Logging
+        "PRAGMA synchronous=NORMAL",  # Balance between safety and speed
+        "PRAGMA cache_size=-65536",  # 64 MiB page cache, independent of page_size
+        "PRAGMA temp_store=MEMORY",  # Use memory for temporary tables
+        "PRAGMA mmap_size=268435456",  # Memory-map up to 256 MiB to skip pager copies on reads
+        "PRAGMA wal_autocheckpoint=1000",  # Checkpoint the WAL every 1000 pages
+        "PRAGMA cache_spill=FALSE",  # Keep dirty pages in cache instead of spilling mid-transaction
+    )
+
+    _PRAGMA_SCRIPT = " ".join(f"{pragma};" for pragma in CONNECTION_PRAGMAS)
+
+    # Refresh planner statistics with PRAGMA optimize every N returns of a connection
+    OPTIMIZE_INTERVAL = 1000
+
     def __init__(self, db_path: str, pool_size: int = 5, timeout: float = 30.0):
         """Initialize connection pool"""
         self.db_path = db_path
         self.pool_size = pool_size
         self.timeout = timeout
-        self.pool = Queue(maxsize=pool_size)
+        self.pool: deque[sqlite3.Connection] = deque(maxlen=pool_size)
         self.all_connections = set()
-        self.lock = threading.RLock()
+        # sqlite3.Connection is not weak-referenceable; entries are dropped
+        # whenever a connection leaves all_connections
+        self.return_counts: dict[sqlite3.Connection, int] = {}
+        # Guards set/dict mutations and the room check in _put_back only;
+        # borrowing is a lock-free deque.popleft(). Never re-entered.
+        self.lock = threading.Lock()
 
         # Pre-populate pool with connections
         self._populate_pool()
@@ -40,71 +145,85 @@ class ConnectionPool:
             for _ in range(self.pool_size):
                 try:
                     conn = self._create_connection()
-                    self.pool.put(conn, block=False)
+                    self.pool.append(conn)
                     self.all_connections.add(conn)
-                except Full:
-                    break
                 except Exception as e:
                     logger.warning(f"Failed to create initial connection: {e}")
 
     def _create_connection(self) -> sqlite3.Connection:
         """Create a new database connection with optimized settings"""
+        return self.open_connection(self.db_path, self.timeout)
+
+    @classmethod
+    def open_connection(cls, db_path: str, timeout: float) -> sqlite3.Connection:
+        """Open a connection with the pool's optimized settings applied"""
         conn = sqlite3.connect(
-            self.db_path,
-            timeout=self.timeout,
+            db_path,
+            timeout=timeout,
             check_same_thread=False,  # Allow connection sharing between threads
+            cached_statements=STATEMENT_CACHE_SIZE,
         )
 
-        # Optimize SQLite settings for better performance
-        conn.execute("PRAGMA journal_mode=WAL")  # Write-Ahead Logging
-        conn.execute("PRAGMA synchronous=NORMAL")  # Balance between safety and speed
-        conn.execute("PRAGMA cache_size=10000")  # Increase cache size
-        conn.execute("PRAGMA temp_store=MEMORY")  # Use memory for temporary tables
+        # Optimize SQLite settings for better performance in a single round trip;
+        # busy_timeout lets SQLite wait on locks before surfacing "database is locked"
+        conn.executescript(f"{cls._PRAGMA_SCRIPT} PRAGMA busy_timeout={int(timeout * 1000)};")
+
+        # Rows support both index and name access, so every connection uses them
+        conn.row_factory = sqlite3.Row
 
         return conn
 
     def get_connection(self, timeout: float | None = None) -> sqlite3.Connection:
-        """Get a connection from the pool with timeout"""
-        timeout = timeout or self.timeout
+        """Get a connection from the pool
 
+        Never blocks: when every pooled connection is borrowed a temporary
+        connection is opened instead. ``timeout`` is kept for API compatibility.
+        """
         try:
-            # Try to get a connection from pool
-            conn = self.pool.get(timeout=timeout)
-
-            # Test connection is still valid
-            try:
-                conn.execute("SELECT 1").fetchone()
-                return conn
-            except sqlite3.Error:
-                # Connection is bad, create a new one
-                logger.warning("Stale connection detected, creating new one")
-                with self.lock:
-                    self.all_connections.discard(conn)
-                with suppress(Exception):
-                    conn.close()
-
-                # Create new connection
-                new_conn = self._create_connection()
-                with self.lock:
-                    self.all_connections.add(new_conn)
-                return new_conn
+            # Local SQLite connections do not go stale; broken ones are
+            # replaced by discard_connection when a query fails on them.
+            # deque.popleft is atomic, so the common path takes no lock.
+            return self.pool.popleft()
 
-        except Empty:
+        except IndexError:
             # Pool is empty, create temporary connection
             logger.warning("Connection pool exhausted, creating temporary connection")
             return self._create_connection()
 
+    def _put_back(self, conn: sqlite3.Connection) -> bool:
+        """Append a connection to the idle pool if there is room"""
+        with self.lock:
+            if len(self.pool) < self.pool_size:
+                self.pool.append(conn)
+                return True
+        return False
+
+    def _maybe_optimize(self, conn: sqlite3.Connection):
+        """Run PRAGMA optimize on every OPTIMIZE_INTERVAL-th return of a connection"""
+        with self.lock:
+            count = self.return_counts.get(conn, 0) + 1
+            self.return_counts[conn] = count
+
+        if count % self.OPTIMIZE_INTERVAL == 0:
+            conn.execute("PRAGMA optimize")
+
     def return_connection(self, conn: sqlite3.Connection):
         """Return a connection to the pool"""
         if conn in self.all_connections:
             try:
-                # Test connection before returning to pool
-                conn.execute("SELECT 1").fetchone()
-                self.pool.put(conn, block=False)
-            except (sqlite3.Error, Full):
+                # Never hand the next borrower an open transaction
+                if conn.in_transaction:
+                    conn.rollback()
+                self._maybe_optimize(conn)
+                returned = self._put_back(conn)
+            except sqlite3.Error:
+                returned = False
+
+            if not returned:
                 # Connection is bad or pool is full, close it
                 with self.lock:
                     self.all_connections.discard(conn)
+                    self.return_counts.pop(conn, None)
                 with suppress(Exception):
                     conn.close()
         else:
@@ -112,16 +231,39 @@ class ConnectionPool:
             with suppress(Exception):
                 conn.close()
 
+    def discard_connection(self, conn: sqlite3.Connection):
+        """Drop a broken connection and put a fresh one in its place"""
+        with self.lock:
+            pooled = conn in self.all_connections
+            self.all_connections.discard(conn)
+            self.return_counts.pop(conn, None)
+        with suppress(Exception):
+            conn.close()
+
+        if pooled:
+            logger.warning("Broken pooled connection detected, replacing it")
+            try:
+                new_conn = self._create_connection()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to replace pooled connection: {e}")
+                return
+            with self.lock:
+                self.all_connections.add(new_conn)
+            if not self._put_back(new_conn):
+                with self.lock:
+                    self.all_connections.discard(new_conn)
+                new_conn.close()
+
     def close_all(self):
         """Close all connections in the pool"""
         with self.lock:
-            # Empty the pool queue
-            while not self.pool.empty():
-                try:
-                    conn = self.pool.get_nowait()
+            # Empty the idle pool, saving planner statistics before closing
+            while self.pool:
+                conn = self.pool.popleft()
+                with suppress(sqlite3.Error):
+                    conn.execute("PRAGMA optimize")
+                with suppress(sqlite3.Error):
                     conn.close()
-                except (Empty, sqlite3.Error):
-                    pass
 
             # Close any remaining connections
             for conn in list(self.all_connections):
@@ -129,21 +271,47 @@ class ConnectionPool:
                     conn.close()
 
             self.all_connections.clear()
+            self.return_counts.clear()
 
     def get_stats(self) -> dict[str, Any]:
         """Get connection pool statistics"""
         with self.lock:
             return {
                 "pool_size": self.pool_size,
-                "available_connections": self.pool.qsize(),
+                "available_connections": len(self.pool),
                 "total_connections": len(self.all_connections),
                 "timeout": self.timeout,
             }
 
 
+class _ThreadConnection:
+    """A pooled connection bound to one thread, handed back to its pool when the thread ends"""
+
+    __slots__ = ("conn", "pool", "_finalizer", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection, pool: ConnectionPool):
+        self.conn = conn
+        self.pool = pool
+        # threading.local drops this holder when its thread exits
+        self._finalizer = weakref.finalize(self, pool.return_connection, conn)
+
+    def detach(self):
+        """Forget the connection without returning it to the pool"""
+        self._finalizer.detach()
+
+
 class DatabaseManager:
     """Centralized database manager for lifecycle MCP operations"""
 
+    # Rows committed per transaction by execute_many
+    BULK_CHUNK_SIZE = 10_000
+
+    # Page cache used by non-durable execute_many calls (256 MiB)
+    BULK_CACHE_SIZE = -262144
+
+    # Keys bound per IN (...) lookup; below SQLite's historical 999-parameter limit
+    IN_CHUNK_SIZE = 900
+
     def __init__(
         self,
         db_path: str | None = None,
@@ -164,6 +332,29 @@ class DatabaseManager:
         # Initialize database and connection pool
         self._ensure_database_exists()
 
+        # SQLite serializes writers anyway, so all writes share one dedicated
+        # connection instead of contending for the file lock from the pool
+        self._write_lock = threading.RLock()
+        self._writer_conn = self._open_writer()
+
+        # Each thread keeps the pooled reader it first borrowed, so a request
+        # issuing several queries does not bounce connections through the pool
+        self._tls = threading.local()
+
+        # Worker threads for blocking database calls from async code. One
+        # pooled reader is left for the event loop thread, so every worker
+        # can keep its own reader without exhausting the pool.
+        self.executor = ThreadPoolExecutor(max_workers=max(1, pool_size - 1), thread_name_prefix="lifecycle-db")
+
+        # Migrations are checked on the first borrow rather than at startup
+        self._migrations_checked = threading.Event()
+
+        # Unique names for savepoints taken by nested transaction() blocks
+        self._savepoint_ids = itertools.count()
+
+        # Precompiled inserts for tables whose column set never varies
+        self._specialized_inserts: dict[str, tuple[frozenset[str], str, Any]] = {}
+
         if self.enable_pooling:
             self.connection_pool = ConnectionPool(self.db_path, pool_size=pool_size, timeout=timeout)
             logger.info(f"Database connection pool initialized: {pool_size} connections, {timeout}s timeout")
@@ -175,65 +366,170 @@ class DatabaseManager:
         """Initialize database with schema if needed"""
         if not Path(self.db_path).exists():
             logger.info(f"Creating new database at {self.db_path}")
-            conn = sqlite3.connect(self.db_path)
-            schema_path = Path(__file__).parent / "lifecycle-schema.sql"
-            if schema_path.exists():
-                with open(schema_path, encoding="utf-8") as f:
-                    conn.executescript(f.read())
-                logger.info("Database schema initialized")
+            # Read before connecting so a missing schema does not leave an empty file behind
+            schema_sql = _load_schema_sql()
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            try:
+                # page_size only takes effect before the first table is created
+                conn.execute("PRAGMA page_size=4096")
+                # One transaction around the script: a single commit instead of one per statement
+                conn.executescript(f"BEGIN;\n{schema_sql}\nCOMMIT;")
+            finally:
+                conn.close()
+            # Record the schema version now so later starts skip the migration pass
+            apply_all_migrations(self.db_path)
+            logger.info("Database schema initialized")
+
+    def _open_writer(self) -> sqlite3.Connection:
+        """Open the writer connection; implicit transactions begin IMMEDIATE"""
+        conn = ConnectionPool.open_connection(self.db_path, self.timeout)
+        conn.isolation_level = "IMMEDIATE"
+        return conn
+
+    def _acquire_writer(self, timeout: float | None = None) -> sqlite3.Connection:
+        """Take the write lock and return the dedicated writer connection"""
+        if not self._write_lock.acquire(timeout=timeout or self.timeout):
+            raise sqlite3.OperationalError("database is locked: timed out waiting for writer connection")
+        return self._writer_conn
+
+    def _acquire_reader(self, timeout: float | None = None) -> sqlite3.Connection:
+        """Return this thread's pooled reader, borrowing one from the pool on first use"""
+        holder = getattr(self._tls, "holder", None)
+        if holder is not None and holder.pool is self.connection_pool:
+            return holder.conn
+
+        conn = self.connection_pool.get_connection(timeout=timeout)
+        # Only pooled connections are bound; temporary overflow ones are closed after use
+        if conn in self.connection_pool.all_connections:
+            self._tls.holder = _ThreadConnection(conn, self.connection_pool)
+        return conn
+
+    def _unbind_reader(self, conn: sqlite3.Connection) -> bool:
+        """Drop this thread's binding to conn; returns False if conn was not bound"""
+        holder = getattr(self._tls, "holder", None)
+        if holder is None or holder.conn is not conn:
+            return False
+        holder.detach()
+        del self._tls.holder
+        return True
+
+    def _is_thread_reader(self, conn: sqlite3.Connection) -> bool:
+        """Check whether conn is the reader bound to the current thread"""
+        holder = getattr(self._tls, "holder", None)
+        return holder is not None and holder.conn is conn and holder.pool is self.connection_pool
+
+    def _release_connection(self, conn: sqlite3.Connection, writable: bool):
+        """Hand a connection back to wherever it was borrowed from"""
+        if writable:
+            self._write_lock.release()
+        elif self.enable_pooling and self.connection_pool:
+            if self._is_thread_reader(conn):
+                # Stays bound to the thread; just make sure no transaction leaks
+                if conn.in_transaction:
+                    with suppress(sqlite3.Error):
+                        conn.rollback()
             else:
-                logger.error(f"Schema file not found at {schema_path}")
-                raise FileNotFoundError(f"Schema file not found at {schema_path}")
+                self.connection_pool.return_connection(conn)
+        else:
             conn.close()
 
-        # Apply any pending migrations
-        apply_all_migrations(self.db_path)
-
-    @contextmanager
-    def get_connection(self, row_factory: bool = False, timeout: float | None = None):
-        """Context manager for database connections with pooling and retry logic"""
-        conn = None
-        for attempt in range(self.retry_attempts):
+    def _discard_connection(self, conn: sqlite3.Connection, writable: bool):
+        """Throw away a connection that failed because it was closed, rebuilding it"""
+        if writable:
+            with suppress(Exception):
+                conn.close()
             try:
-                if self.enable_pooling and self.connection_pool:
-                    conn = self.connection_pool.get_connection(timeout=timeout)
-                else:
-                    conn = sqlite3.connect(self.db_path, timeout=timeout or self.timeout)
+                self._writer_conn = self._open_writer()
+            finally:
+                self._write_lock.release()
+        elif self.enable_pooling and self.connection_pool:
+            self._unbind_reader(conn)
+            self.connection_pool.discard_connection(conn)
+        else:
+            with suppress(Exception):
+                conn.close()
 
-                if row_factory:
-                    conn.row_factory = sqlite3.Row
+    @staticmethod
+    def _is_closed_connection_error(error: Exception) -> bool:
+        """Check whether an error means the connection itself is unusable"""
+        return isinstance(error, sqlite3.ProgrammingError) and "closed" in str(error).lower()
+
+    def _apply_pending_migrations(self):
+        """Bring the schema up to date; a single PRAGMA read when it already is"""
+        with self._write_lock:
+            if self._migrations_checked.is_set():
+                return
+            version = self._writer_conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < LATEST_SCHEMA_VERSION:
+                apply_all_migrations(self.db_path)
+            self._migrations_checked.set()
+
+    def _acquire_connection(self, writable: bool, timeout: float | None = None) -> sqlite3.Connection:
+        """Borrow the writer, this thread's pooled reader, or a one-off connection"""
+        if not self._migrations_checked.is_set():
+            self._apply_pending_migrations()
+        if writable:
+            return self._acquire_writer(timeout)
+        if self.enable_pooling and self.connection_pool:
+            return self._acquire_reader(timeout)
+        conn = sqlite3.connect(self.db_path, timeout=timeout or self.timeout, cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        return conn
 
-                yield conn
-                return  # Success, exit retry loop
+    def _recover_connection(self, conn: sqlite3.Connection, writable: bool, error: Exception):
+        """Clean up a connection after a failed operation; returns None if it was discarded"""
+        if self._is_closed_connection_error(error):
+            # Rebuild lazily instead of probing every borrow
+            self._discard_connection(conn, writable)
+            return None
+        with suppress(Exception):
+            conn.rollback()
+        return conn
 
-            except sqlite3.OperationalError as e:
-                if conn:
-                    with suppress(Exception):
-                        conn.rollback()
+    def _begin_immediate(self, conn: sqlite3.Connection):
+        """Start a write transaction, taking the RESERVED lock up front
 
-                # Check if this is a retry-able error
-                if "database is locked" in str(e).lower() or "disk I/O error" in str(e).lower():
-                    if attempt < self.retry_attempts - 1:
-                        logger.warning(f"Database operation failed (attempt {attempt + 1}/{self.retry_attempts}): {e}")
-                        time.sleep(self.retry_delay * (2**attempt))  # Exponential backoff
-                        continue
+        Lock waits are handled by SQLite's busy_timeout; only a stale WAL
+        snapshot, which busy_timeout does not cover, is retried here.
+        """
+        for attempt in range(self.retry_attempts):
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as e:
+                if getattr(e, "sqlite_errorcode", None) != SQLITE_BUSY_SNAPSHOT or attempt == self.retry_attempts - 1:
+                    raise
+                logger.warning(f"Stale WAL snapshot (attempt {attempt + 1}/{self.retry_attempts}), retrying")
 
-                logger.error(f"Database operation failed after {self.retry_attempts} attempts: {e}")
-                raise
+    @contextmanager
+    def get_connection(self, row_factory: bool = False, timeout: float | None = None, writable: bool = False):
+        """Context manager for database connections with pooling
+
+        Lock contention is absorbed by SQLite's busy_timeout on each connection
+        rather than by sleeping and retrying in Python.
+
+        Args:
+            row_factory: Ignored; every connection already returns sqlite3.Row
+            timeout: Override the default connection timeout
+            writable: Use the dedicated writer connection instead of a pooled reader
+        """
+        conn = self._acquire_connection(writable, timeout)
+        # Re-entrant use of the writer inside transaction(writable=True): the
+        # enclosing block owns the transaction, so a failed statement here
+        # must not roll it back
+        nested = writable and conn.in_transaction
+        try:
+            yield conn
 
-            except Exception as e:
-                if conn:
-                    with suppress(Exception):
-                        conn.rollback()
-                logger.error(f"Database operation failed: {str(e)}")
-                raise
+        except Exception as e:
+            if not nested or self._is_closed_connection_error(e):
+                conn = self._recover_connection(conn, writable, e)
+            logger.error(f"Database operation failed: {str(e)}")
+            raise
 
-            finally:
-                if conn:
-                    if self.enable_pooling and self.connection_pool:
-                        self.connection_pool.return_connection(conn)
-                    else:
-                        conn.close()
+        finally:
+            if conn:
+                self._release_connection(conn, writable)
 
     def execute_query(
         self,
@@ -241,12 +537,24 @@ class DatabaseManager:
         params: list[Any] | None = None,
         fetch_one: bool = False,
         fetch_all: bool = False,
-        row_factory: bool = False,
+        commit: bool = True,
     ) -> list | sqlite3.Row | None:
-        """Execute a query and return results"""
+        """Execute a query and return results
+
+        Writes issued inside an outer transaction(writable=True) block join
+        that transaction and are committed by the outer block. commit=False
+        is only accepted there; a standalone write is always committed, as
+        leaving the shared writer mid-transaction would swallow every later
+        write into it.
+        """
         params = params or []
+        # Anything that is not a fetch is a write and goes to the writer connection
+        writable = not (fetch_one or fetch_all)
 
-        with self.get_connection(row_factory=row_factory) as conn:
+        with self.get_connection(writable=writable) as conn:
+            joined = writable and conn.in_transaction
+            if writable and not commit and not joined:
+                raise ValueError("commit=False requires an enclosing transaction(writable=True) block")
             cur = conn.cursor()
             cur.execute(query, params)
 
@@ -256,104 +564,198 @@ class DatabaseManager:
                 return cur.fetchall()
             else:
                 # For INSERT/UPDATE/DELETE operations
-                conn.commit()
+                if commit and not joined:
+                    conn.commit()
                 return cur.lastrowid
 
-    def execute_many(self, query: str, params_list: list[list[Any]]) -> None:
-        """Execute a query multiple times with different parameters"""
-        with self.get_connection() as conn:
-            cur = conn.cursor()
-            cur.executemany(query, params_list)
-            conn.commit()
+    def execute_many(self, query: str, params_list: list[list[Any]], durable: bool = True) -> None:
+        """Execute a query multiple times with different parameters
+
+        Rows are written in BULK_CHUNK_SIZE windows, each committed in its own
+        BEGIN IMMEDIATE transaction so the WAL can be checkpointed between
+        them. Pass durable=False for bulk loads that can be redone after a
+        crash: synchronous is switched off and the page cache enlarged until
+        the call returns.
+
+        Inside an outer transaction(writable=True) block the rows join that
+        transaction instead and are committed by it; durable=False is
+        rejected there because synchronous cannot change mid-transaction.
+        """
+        with self.get_connection(writable=True) as conn:
+            if conn.in_transaction:
+                if not durable:
+                    raise ValueError("execute_many(durable=False) cannot run inside an open transaction")
+                for start in range(0, len(params_list), self.BULK_CHUNK_SIZE):
+                    conn.executemany(query, params_list[start : start + self.BULK_CHUNK_SIZE])
+                return
+
+            if not durable:
+                synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+                cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+                conn.execute("PRAGMA synchronous=OFF")
+                conn.execute(f"PRAGMA cache_size={self.BULK_CACHE_SIZE}")
 
-    @contextmanager
-    def transaction(self, row_factory: bool = False, timeout: float | None = None):
-        """Context manager for database transactions with pooling and retry logic"""
-        conn = None
-        for attempt in range(self.retry_attempts):
             try:
-                if self.enable_pooling and self.connection_pool:
-                    conn = self.connection_pool.get_connection(timeout=timeout)
-                else:
-                    conn = sqlite3.connect(self.db_path, timeout=timeout or self.timeout)
-
-                if row_factory:
-                    conn.row_factory = sqlite3.Row
-
-                yield conn.cursor()
-                conn.commit()
-                return  # Success, exit retry loop
-
-            except sqlite3.OperationalError as e:
-                if conn:
-                    with suppress(Exception):
+                for start in range(0, len(params_list), self.BULK_CHUNK_SIZE):
+                    self._begin_immediate(conn)
+                    conn.executemany(query, params_list[start : start + self.BULK_CHUNK_SIZE])
+                    conn.commit()
+            finally:
+                if not durable:
+                    if conn.in_transaction:
                         conn.rollback()
+                    conn.execute(f"PRAGMA synchronous={synchronous}")
+                    conn.execute(f"PRAGMA cache_size={cache_size}")
 
-                # Check if this is a retry-able error
-                if "database is locked" in str(e).lower() or "disk I/O error" in str(e).lower():
-                    if attempt < self.retry_attempts - 1:
-                        logger.warning(f"Transaction failed (attempt {attempt + 1}/{self.retry_attempts}): {e}")
-                        time.sleep(self.retry_delay * (2**attempt))  # Exponential backoff
-                        continue
+    @contextmanager
+    def transaction(self, row_factory: bool = False, timeout: float | None = None, writable: bool = False):
+        """Context manager for database transactions with pooling
+
+        Pass writable=True to run the transaction on the dedicated writer
+        connection; it is opened with BEGIN IMMEDIATE so the write lock is
+        taken at the start instead of being upgraded at the first write.
+        ``row_factory`` is ignored; rows are always sqlite3.Row.
+
+        Opened on a connection that is already inside a transaction (a nested
+        call on the writer or on this thread's reader), the block runs in a
+        SAVEPOINT instead: it neither commits the enclosing work on success
+        nor rolls it back on failure.
+        """
+        conn = self._acquire_connection(writable, timeout)
+        savepoint = f"sp_{next(self._savepoint_ids)}" if conn.in_transaction else None
+        try:
+            if savepoint:
+                conn.execute(f"SAVEPOINT {savepoint}")
+            elif writable:
+                self._begin_immediate(conn)
 
-                logger.error(f"Transaction failed after {self.retry_attempts} attempts: {e}")
-                raise
+            yield conn.cursor()
 
-            except Exception as e:
-                if conn:
-                    with suppress(Exception):
-                        conn.rollback()
-                logger.error(f"Transaction failed: {str(e)}")
-                raise
+            if savepoint:
+                conn.execute(f"RELEASE {savepoint}")
+            else:
+                conn.commit()
 
-            finally:
-                if conn:
-                    if self.enable_pooling and self.connection_pool:
-                        self.connection_pool.return_connection(conn)
-                    else:
-                        conn.close()
+        except Exception as e:
+            if savepoint and not self._is_closed_connection_error(e):
+                with suppress(sqlite3.Error):
+                    conn.execute(f"ROLLBACK TO {savepoint}")
+                    conn.execute(f"RELEASE {savepoint}")
+            else:
+                conn = self._recover_connection(conn, writable, e)
+            logger.error(f"Transaction failed: {str(e)}")
+            raise
+
+        finally:
+            if conn:
+                self._release_connection(conn, writable)
 
     def get_next_id(
         self, table: str, id_column: str, where_clause: str = "", where_params: list[Any] | None = None
     ) -> int:
-        """Get next available ID for a table with optional filtering"""
-        where_params = where_params or []
+        """Get next available ID for a table with optional filtering
 
-        if where_clause:
-            query = f"SELECT COALESCE(MAX({id_column}), 0) + 1 FROM {table} WHERE {where_clause}"
-        else:
-            query = f"SELECT COALESCE(MAX({id_column}), 0) + 1 FROM {table}"
+        MAX() over an indexed column (see idx_requirements_type_number and
+        idx_tasks_task_number) is resolved by SQLite as a single index seek.
+
+        The read goes through the writer connection. Called inside
+        transaction(writable=True), it sees the block's own uncommitted rows
+        and no other writer can insert before the block commits, so the
+        number cannot be handed out twice.
+        """
+        query = _build_next_id_sql(table, id_column, where_clause)
 
-        result = self.execute_query(query, where_params, fetch_one=True)
+        with self.get_connection(writable=True) as conn:
+            result = conn.execute(query, where_params or []).fetchone()
         return result[0] if result else 1
 
+    @staticmethod
+    def rows_to_dicts(rows: list[sqlite3.Row]) -> list[dict[str, Any]]:
+        """Convert result rows to dicts, reading the column names only once
+
+        dict(zip(keys, row)) walks each row as a plain sequence, which is about
+        twice as fast as dict(row) resolving every column name per row. Rows
+        that are not sqlite3.Row (e.g. dicts from test doubles) are copied
+        the old way.
+        """
+        if not rows:
+            return []
+        if not isinstance(rows[0], sqlite3.Row):
+            return [dict(row) if hasattr(row, "keys") else row for row in rows]
+
+        keys = rows[0].keys()
+        return [dict(zip(keys, row, strict=False)) for row in rows]
+
     def check_exists(self, table: str, where_clause: str, where_params: list[Any]) -> bool:
         """Check if a record exists in the table"""
-        query = f"SELECT 1 FROM {table} WHERE {where_clause} LIMIT 1"
-        result = self.execute_query(query, where_params, fetch_one=True)
-        return result is not None
+        query = _build_exists_sql(table, where_clause)
+        return bool(self.execute_query(query, where_params, fetch_one=True)[0])
+
+    def check_exists_many(self, table: str, column: str, values: list[Any]) -> list[bool]:
+        """Check which of several values exist in a column
+
+        Values are looked up with IN (...) in IN_CHUNK_SIZE batches, so large
+        inputs stay under SQLite's bound-parameter limit.
+        """
+        if not values:
+            return []
+
+        found = self.get_records_in(table, column, column, values)
+        return [value in found for value in values]
+
+    def register_insert(self, table: str, columns: tuple[str, ...]) -> None:
+        """Precompile the INSERT for a fixed column set of a table
+
+        insert_record calls whose keys match the registered columns skip
+        rebuilding the column list and pull their values with a single
+        itemgetter call, regardless of the key order in the dict.
+        """
+        query = _build_insert_sql(table, columns)
+        if len(columns) == 1:
+            column = columns[0]
+
+            def getter(data):
+                return (data[column],)
+        else:
+            getter = itemgetter(*columns)
+
+        self._specialized_inserts[table] = (frozenset(columns), query, getter)
 
     def insert_record(self, table: str, data: dict[str, Any]) -> int | None:
         """Insert a record into the table and return the row ID"""
-        columns = list(data.keys())
-        placeholders = ["?" for _ in columns]
-        values = list(data.values())
+        specialized = self._specialized_inserts.get(table)
+        if specialized is not None and data.keys() == specialized[0]:
+            return self.execute_query(specialized[1], specialized[2](data))
+
+        query = _build_insert_sql(table, tuple(data.keys()))
+        return self.execute_query(query, list(data.values()))
 
-        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
-        return self.execute_query(query, values)
+    def insert_many(self, table: str, rows: list[dict[str, Any]]) -> None:
+        """Insert several records with the same columns in a single transaction
+
+        Raises ValueError before writing anything if the rows' keys differ.
+        """
+        if not rows:
+            return
+
+        keys = rows[0].keys()
+        if any(row.keys() != keys for row in rows):
+            raise ValueError(f"insert_many into {table} requires every row to have the same keys")
+
+        columns = tuple(keys)
+        query = _build_insert_sql(table, columns)
+
+        with self.transaction(writable=True) as cur:
+            cur.executemany(query, [[row[column] for column in columns] for row in rows])
 
     def update_record(self, table: str, data: dict[str, Any], where_clause: str, where_params: list[Any]) -> None:
         """Update records in the table"""
-        set_clauses = [f"{column} = ?" for column in data]
-        values = list(data.values()) + where_params
-
-        query = f"UPDATE {table} SET {', '.join(set_clauses)} WHERE {where_clause}"
-        self.execute_query(query, values)
+        query = _build_update_sql(table, tuple(data.keys()), where_clause)
+        self.execute_query(query, list(data.values()) + where_params)
 
     def delete_record(self, table: str, where_clause: str, where_params: list[Any]) -> None:
         """Delete records from the table"""
-        query = f"DELETE FROM {table} WHERE {where_clause}"
-        self.execute_query(query, where_params)
+        self.execute_query(_build_delete_sql(table, where_clause), where_params)
 
     def get_records(
         self,
@@ -363,23 +765,54 @@ class DatabaseManager:
         where_params: list[Any] | None = None,
         order_by: str = "",
         limit: int | None = None,
-        row_factory: bool = True,
+        offset: int | None = None,
     ) -> list[sqlite3.Row]:
-        """Get records from the table with optional filtering and ordering"""
-        where_params = where_params or []
-
-        query = f"SELECT {columns} FROM {table}"
-
-        if where_clause:
-            query += f" WHERE {where_clause}"
-
-        if order_by:
-            query += f" ORDER BY {order_by}"
+        """Get records from the table with optional filtering, ordering and paging"""
+        return list(self.iter_records(table, columns, where_clause, where_params, order_by, limit, offset=offset))
 
+    def iter_records(
+        self,
+        table: str,
+        columns: str = "*",
+        where_clause: str = "",
+        where_params: list[Any] | None = None,
+        order_by: str = "",
+        limit: int | None = None,
+        batch_size: int = 1000,
+        offset: int | None = None,
+    ) -> Iterator[sqlite3.Row]:
+        """Stream records from the table in batches instead of materializing them all
+
+        The connection stays checked out until the iterator is exhausted or closed.
+        """
+        params = list(where_params or [])
         if limit:
-            query += f" LIMIT {limit}"
+            params.append(limit)
+        if offset:
+            params.append(offset)
 
-        return self.execute_query(query, where_params, fetch_all=True, row_factory=row_factory)
+        query = _build_select_sql(table, columns, where_clause, order_by, bool(limit), bool(offset))
+        with self.get_connection() as conn:
+            cur = conn.execute(query, params)
+            while rows := cur.fetchmany(batch_size):
+                yield from rows
+
+    def get_records_in(self, table: str, columns: str, key_column: str, keys: list[Any]) -> dict[Any, sqlite3.Row]:
+        """Fetch the records whose key_column is one of keys, mapped by key
+
+        Keys are looked up with IN (...) in IN_CHUNK_SIZE batches to stay under
+        SQLite's bound-parameter limit. Keys without a matching row are absent
+        from the result. columns must include key_column.
+        """
+        found: dict[Any, sqlite3.Row] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self.get_connection() as conn:
+            for start in range(0, len(unique_keys), self.IN_CHUNK_SIZE):
+                chunk = unique_keys[start : start + self.IN_CHUNK_SIZE]
+                where = f"{key_column} IN ({', '.join('?' * len(chunk))})"
+                for row in conn.execute(_build_select_sql(table, columns, where, "", False), chunk):
+                    found[row[key_column]] = row
+        return found
 
     def configure_pool(
         self, pool_size: int | None = None, timeout: float | None = None, enable_pooling: bool | None = None
@@ -461,9 +894,16 @@ class DatabaseManager:
 
     def close(self):
         """Close all database connections and clean up resources"""
+        # Let in-flight work finish before its connections are closed
+        self.executor.shutdown(wait=True)
         if self.connection_pool:
             self.connection_pool.close_all()
             logger.info("Database connection pool closed")
+        with self._write_lock:
+            with suppress(sqlite3.Error):
+                self._writer_conn.execute("PRAGMA optimize")
+            with suppress(sqlite3.Error):
+                self._writer_conn.close()
 
     def __enter__(self):
         """Context manager entry"""
@@ -6,10 +6,13 @@ Provides GitHub CLI integration for issue management
 
 import asyncio
 import json
+import logging
 import subprocess
 from datetime import datetime, timezone
 from typing import Any
 
+logger = logging.getLogger(__name__)
+
 
 class GitHubUtils:
     """Utilities for GitHub CLI integration"""
@@ -68,11 +71,11 @@ class GitHubUtils:
                 return stdout.decode().strip()
             else:
                 # Issue creation failed, but don't error the main operation
-                print(f"GitHub issue creation failed: {stderr.decode()}")
+                logger.error("GitHub issue creation failed: %s", stderr.decode())
                 return None
 
         except Exception as e:
-            print(f"Error creating GitHub issue: {e}")
+            logger.error("Error creating GitHub issue: %s", e)
             return None
 
     @staticmethod
@@ -95,7 +98,7 @@ class GitHubUtils:
         )
 
         if not success and error_msg:
-            print(f"Error updating GitHub issue: {error_msg}")
+            logger.error("Error updating GitHub issue: %s", error_msg)
 
         return success
 
@@ -172,11 +175,11 @@ class GitHubUtils:
                 issue_data["etag"] = GitHubUtils._generate_etag(issue_data)
                 return issue_data
             else:
-                print(f"Error retrieving GitHub issue: {stderr.decode()}")
+                logger.error("Error retrieving GitHub issue: %s", stderr.decode())
                 return None
 
         except Exception as e:
-            print(f"Error getting GitHub issue: {e}")
+            logger.error("Error getting GitHub issue: %s", e)
             return None
 
     @staticmethod
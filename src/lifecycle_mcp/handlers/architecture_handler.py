@@ -145,40 +145,44 @@ class ArchitectureHandler(BaseHandler):
             return self._create_error_response(error)
 
         try:
-            # Get next ADR number
-            adr_number = self.db.execute_query(
+            # Numbering, insert and links commit together; reading the number
+            # on the writer also keeps concurrent creates from sharing it
+            with self.db.transaction(writable=True) as cursor:
+                # Get next ADR number
+                adr_number = cursor.execute(
+                    """
+                    SELECT COALESCE(MAX(CAST(SUBSTR(id, 5, 4) AS INTEGER)), 0) + 1
+                    FROM architecture
+                    WHERE type = 'ADR'
                 """
-                SELECT COALESCE(MAX(CAST(SUBSTR(id, 5, 4) AS INTEGER)), 0) + 1
-                FROM architecture
-                WHERE type = 'ADR'
-            """,
-                fetch_one=True,
-            )[0]
-
-            adr_id = f"ADR-{adr_number:04d}"
-
-            # Prepare architecture data
-            arch_data = {
-                "id": adr_id,
-                "type": "ADR",
-                "title": params["title"],
-                "status": "Proposed",
-                "context": params["context"],
-                "decision_outcome": params["decision"],
-                "decision_drivers": self._safe_json_dumps(params.get("decision_drivers", [])),
-                "considered_options": self._safe_json_dumps(params.get("considered_options", [])),
-                "consequences": self._safe_json_dumps(params.get("consequences", {})),
-                "authors": self._safe_json_dumps(params.get("authors", ["MCP User"])),
-            }
-
-            # Insert ADR
-            self.db.insert_record("architecture", arch_data)
-
-            # Link to requirements
-            for req_id in params["requirement_ids"]:
-                self.db.insert_record(
+                ).fetchone()[0]
+
+                adr_id = f"ADR-{adr_number:04d}"
+
+                # Prepare architecture data
+                arch_data = {
+                    "id": adr_id,
+                    "type": "ADR",
+                    "title": params["title"],
+                    "status": "Proposed",
+                    "context": params["context"],
+                    "decision_outcome": params["decision"],
+                    "decision_drivers": self._safe_json_dumps(params.get("decision_drivers", [])),
+                    "considered_options": self._safe_json_dumps(params.get("considered_options", [])),
+                    "consequences": self._safe_json_dumps(params.get("consequences", {})),
+                    "authors": self._safe_json_dumps(params.get("authors", ["MCP User"])),
+                }
+
+                # Insert ADR
+                self.db.insert_record("architecture", arch_data)
+
+                # Link to requirements
+                self.db.insert_many(
                     "requirement_architecture",
-                    {"requirement_id": req_id, "architecture_id": adr_id, "relationship_type": "addresses"},
+                    [
+                        {"requirement_id": req_id, "architecture_id": adr_id, "relationship_type": "addresses"}
+                        for req_id in params["requirement_ids"]
+                    ],
                 )
 
             # Analyze ADR for diagram suggestions using LLM
@@ -217,17 +221,19 @@ class ArchitectureHandler(BaseHandler):
             current_status = current_arch[0]["status"]
             new_status = params["new_status"]
 
-            # Update status
-            self.db.update_record(
-                "architecture",
-                {"status": new_status, "updated_at": "CURRENT_TIMESTAMP"},
-                "id = ?",
-                [params["architecture_id"]],
-            )
+            # Status change and review comment are committed together
+            with self.db.transaction(writable=True):
+                # Update status
+                self.db.update_record(
+                    "architecture",
+                    {"status": new_status, "updated_at": "CURRENT_TIMESTAMP"},
+                    "id = ?",
+                    [params["architecture_id"]],
+                )
 
-            # Add review comment if provided
-            if params.get("comment"):
-                self._add_review_comment("architecture", params["architecture_id"], params["comment"])
+                # Add review comment if provided
+                if params.get("comment"):
+                    self._add_review_comment("architecture", params["architecture_id"], params["comment"])
 
             # Create above-the-fold response
             key_info = f"Architecture {params['architecture_id']} updated"
@@ -282,7 +288,7 @@ class ArchitectureHandler(BaseHandler):
 
             base_query += " ORDER BY created_at DESC"
 
-            decisions = self.db.execute_query(base_query, where_params, fetch_all=True, row_factory=True)
+            decisions = self.db.execute_query(base_query, where_params, fetch_all=True)
 
             if not decisions:
                 return self._create_above_fold_response(
@@ -360,13 +366,11 @@ class ArchitectureHandler(BaseHandler):
 
             base_query += " ORDER BY created_at DESC"
 
-            decisions = self.db.execute_query(base_query, where_params, fetch_all=True, row_factory=True)
+            decisions = self.db.execute_query(base_query, where_params, fetch_all=True)
 
             # Convert to list of dictionaries with JSON parsing
             decisions_list = []
-            for decision in decisions:
-                decision_dict = dict(decision) if hasattr(decision, 'keys') else decision
-
+            for decision_dict in self._rows_to_dicts(decisions):
                 # Parse JSON fields if they exist as strings
                 json_fields = ['consequences', 'decision_drivers', 'considered_options', 'authors']
                 for field in json_fields:
@@ -450,7 +454,6 @@ class ArchitectureHandler(BaseHandler):
             """,
                 [params["architecture_id"]],
                 fetch_all=True,
-                row_factory=True,
             )
 
             if requirements:
@@ -467,7 +470,6 @@ class ArchitectureHandler(BaseHandler):
             """,
                 [params["architecture_id"]],
                 fetch_all=True,
-                row_factory=True,
             )
 
             if reviews:
@@ -514,6 +516,11 @@ class ArchitectureHandler(BaseHandler):
             self.logger.info("No MCP client available for sampling - skipping diagram suggestions")
             return None
 
+        # Check if the MCP client has sampling capability before preparing the request
+        if not callable(getattr(self.mcp_client, "sample", None)):
+            self.logger.info("MCP client does not support sampling - skipping diagram suggestions")
+            return None
+
         try:
             # Build context for LLM analysis
             adr_context = self._build_adr_context(adr_data)
@@ -529,21 +536,16 @@ class ArchitectureHandler(BaseHandler):
                 "stopSequences": ["```"],
             }
 
-            # Check if the MCP client has sampling capability
-            if hasattr(self.mcp_client, "sample") and callable(self.mcp_client.sample):
-                try:
-                    # Make the actual MCP sampling request
-                    response = await self.mcp_client.sample(sampling_request)
-                    if response and hasattr(response, "content") and hasattr(response.content, "text"):
-                        return json.loads(response.content.text)
-                    else:
-                        self.logger.warning("MCP sampling returned invalid response format")
-                        return None
-                except Exception as sampling_error:
-                    self.logger.warning(f"MCP sampling failed: {sampling_error}")
+            try:
+                # Make the actual MCP sampling request
+                response = await self.mcp_client.sample(sampling_request)
+                if response and hasattr(response, "content") and hasattr(response.content, "text"):
+                    return json.loads(response.content.text)
+                else:
+                    self.logger.warning("MCP sampling returned invalid response format")
                     return None
-            else:
-                self.logger.info("MCP client does not support sampling - skipping diagram suggestions")
+            except Exception as sampling_error:
+                self.logger.warning(f"MCP sampling failed: {sampling_error}")
                 return None
 
         except Exception as e:
@@ -600,7 +602,7 @@ class ArchitectureHandler(BaseHandler):
         """Format list items for context"""
         if not items:
             return "- None specified"
-        return "\n".join(f"- {item}" for item in items)
+        return "- " + "\n- ".join(map(str, items))
 
     def _format_consequences(self, consequences: dict[str, Any]) -> str:
         """Format consequences object for context"""
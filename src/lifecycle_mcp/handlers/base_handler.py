@@ -4,26 +4,57 @@ Base Handler class for MCP Lifecycle Management Server
 Provides common functionality for all domain handlers
 """
 
+import asyncio
+import contextvars
+import functools
 import json
 import logging
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from typing import Any
 
 from mcp.types import TextContent
 
 from ..database_manager import DatabaseManager
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
 class BaseHandler(ABC):
     """Abstract base class for all MCP tool handlers"""
 
+    # Inserts issued with the same columns every time; registered with the
+    # database manager so they skip generic SQL building
+    FIXED_INSERTS = {
+        "lifecycle_events": ("entity_type", "entity_id", "event_type", "actor"),
+        "reviews": ("entity_type", "entity_id", "reviewer", "comment"),
+        "relationships": ("id", "source_type", "source_id", "target_type", "target_id", "relationship_type"),
+        "requirement_tasks": ("requirement_id", "task_id"),
+    }
+
     def __init__(self, db_manager: DatabaseManager):
         """Initialize handler with database manager"""
         self.db = db_manager
         self.logger = logger.getChild(self.__class__.__name__)
 
+        for table, columns in self.FIXED_INSERTS.items():
+            self.db.register_insert(table, columns)
+
+    async def _run_db(self, func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        """Run blocking database work on the database manager's worker threads
+
+        Unlike asyncio.to_thread, the executor is sized to the reader pool, so
+        workers never outnumber the connections they bind to.
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        return await loop.run_in_executor(self.db.executor, call)
+
     def _create_response(self, text: str) -> list[TextContent]:
         """Create standardized response format"""
         return [TextContent(type="text", text=text)]
@@ -76,9 +107,13 @@ class BaseHandler(ABC):
         return f"Found {count} {entity_type}(s)"
 
     def _create_error_response(self, error_msg: str, exception: Exception | None = None) -> list[TextContent]:
-        """Create standardized error response"""
+        """Create standardized error response
+
+        The traceback is only logged when DEBUG logging is enabled.
+        """
         if exception:
-            self.logger.error(f"{error_msg}: {str(exception)}")
+            debug = self.logger.isEnabledFor(logging.DEBUG)
+            self.logger.error("%s: %s", error_msg, exception, exc_info=exception if debug else None)
         else:
             self.logger.error(error_msg)
 
@@ -97,6 +132,8 @@ class BaseHandler(ABC):
         if not json_str:
             return default or []
         try:
+            if orjson is not None:
+                return orjson.loads(json_str)
             return json.loads(json_str)
         except (json.JSONDecodeError, TypeError):
             self.logger.warning(f"Failed to parse JSON: {json_str}")
@@ -104,12 +141,20 @@ class BaseHandler(ABC):
 
     def _safe_json_dumps(self, data: Any) -> str:
         """Safely dump data to JSON string"""
+        if data is None:
+            return "[]"
         try:
-            return json.dumps(data) if data is not None else "[]"
+            if orjson is not None:
+                return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+            return json.dumps(data)
         except (TypeError, ValueError) as e:
             self.logger.warning(f"Failed to serialize to JSON: {str(e)}")
             return "[]"
 
+    def _rows_to_dicts(self, rows: list[Any]) -> list[dict[str, Any]]:
+        """Convert query result rows to JSON-serializable dictionaries"""
+        return DatabaseManager.rows_to_dicts(rows)
+
     def _log_operation(self, entity_type: str, entity_id: str, event_type: str, actor: str = "MCP User"):
         """Log lifecycle events"""
         try:
@@ -120,6 +165,19 @@ class BaseHandler(ABC):
         except Exception as e:
             self.logger.warning(f"Failed to log event: {str(e)}")
 
+    def _log_operations(self, entity_type: str, entity_ids: list[str], event_type: str, actor: str = "MCP User"):
+        """Log the same lifecycle event for several entities with one batched insert"""
+        try:
+            self.db.insert_many(
+                "lifecycle_events",
+                [
+                    {"entity_type": entity_type, "entity_id": entity_id, "event_type": event_type, "actor": actor}
+                    for entity_id in entity_ids
+                ],
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to log events: {str(e)}")
+
     def _add_review_comment(self, entity_type: str, entity_id: str, comment: str, reviewer: str = "MCP User"):
         """Add review comment to an entity"""
         try:
@@ -4,6 +4,7 @@ Export Handler for MCP Lifecycle Management Server
 Handles export and diagram generation operations
 """
 
+import itertools
 import os
 from datetime import datetime
 from typing import Any
@@ -235,7 +236,6 @@ class ExportHandler(BaseHandler):
                 """,
                     [task["id"]],
                     fetch_all=True,
-                    row_factory=True,
                 )
 
                 if linked_reqs:
@@ -252,84 +252,91 @@ class ExportHandler(BaseHandler):
         return [filename]
 
     def _export_architecture(self, project_name: str, output_dir: str) -> list[str]:
-        """Export architecture decisions to markdown file"""
-        architecture = self.db.get_records("architecture", "*", order_by="created_at DESC")
+        """Export architecture decisions to markdown file
 
-        if not architecture:
+        Decisions are streamed from the database and written one at a time.
+        """
+        architecture = self.db.iter_records("architecture", "*", order_by="created_at DESC")
+        first = next(architecture, None)
+
+        if first is None:
             return []
 
         filename = f"{project_name}-architecture.md"
         filepath = os.path.join(output_dir, filename)
 
-        content = f"# {project_name} - Architecture Documentation\n\n"
-        content += f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.write(f"# {project_name} - Architecture Documentation\n\n")
+            f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
 
-        for arch in architecture:
-            content += f"## {arch['id']}: {arch['title']}\n\n"
-            content += f"- **Type**: {arch['type']}\n"
-            content += f"- **Status**: {arch['status']}\n"
-            content += f"- **Created**: {arch['created_at']}\n"
-            content += f"- **Updated**: {arch['updated_at']}\n\n"
-
-            if arch["authors"]:
-                authors = self._safe_json_loads(arch["authors"])
-                if authors:
-                    content += f"- **Authors**: {', '.join(authors)}\n\n"
-
-            content += f"### Context\n{arch['context']}\n\n"
-            content += f"### Decision\n{arch['decision_outcome']}\n\n"
-
-            if arch["decision_drivers"]:
-                drivers = self._safe_json_loads(arch["decision_drivers"])
-                if drivers:
-                    content += "### Decision Drivers\n"
-                    for driver in drivers:
-                        content += f"- {driver}\n"
-                    content += "\n"
+            for arch in itertools.chain([first], architecture):
+                f.write(self._format_architecture_entry(arch))
 
-            if arch["considered_options"]:
-                options = self._safe_json_loads(arch["considered_options"])
-                if options:
-                    content += "### Considered Options\n"
-                    for option in options:
-                        content += f"- {option}\n"
-                    content += "\n"
+        return [filename]
 
-            if arch["consequences"]:
-                consequences = self._safe_json_loads(arch["consequences"])
-                if consequences:
-                    content += "### Consequences\n"
-                    if isinstance(consequences, dict):
-                        for key, value in consequences.items():
-                            content += f"**{key.title()}**: {value}\n"
-                    else:
-                        content += f"{consequences}\n"
-                    content += "\n"
+    def _format_architecture_entry(self, arch) -> str:
+        """Format one architecture decision for the architecture export"""
+        content = f"## {arch['id']}: {arch['title']}\n\n"
+        content += f"- **Type**: {arch['type']}\n"
+        content += f"- **Status**: {arch['status']}\n"
+        content += f"- **Created**: {arch['created_at']}\n"
+        content += f"- **Updated**: {arch['updated_at']}\n\n"
+
+        if arch["authors"]:
+            authors = self._safe_json_loads(arch["authors"])
+            if authors:
+                content += f"- **Authors**: {', '.join(authors)}\n\n"
+
+        content += f"### Context\n{arch['context']}\n\n"
+        content += f"### Decision\n{arch['decision_outcome']}\n\n"
+
+        if arch["decision_drivers"]:
+            drivers = self._safe_json_loads(arch["decision_drivers"])
+            if drivers:
+                content += "### Decision Drivers\n"
+                for driver in drivers:
+                    content += f"- {driver}\n"
+                content += "\n"
 
-            # Get linked requirements
-            linked_reqs = self.db.execute_query(
-                """
-                SELECT r.id, r.title FROM requirements r
-                JOIN requirement_architecture ra ON r.id = ra.requirement_id
-                WHERE ra.architecture_id = ?
-            """,
-                [arch["id"]],
-                fetch_all=True,
-                row_factory=True,
-            )
+        if arch["considered_options"]:
+            options = self._safe_json_loads(arch["considered_options"])
+            if options:
+                content += "### Considered Options\n"
+                for option in options:
+                    content += f"- {option}\n"
+                content += "\n"
 
-            if linked_reqs:
-                content += "### Linked Requirements\n"
-                for req in linked_reqs:
-                    content += f"- {req['id']}: {req['title']}\n"
+        if arch["consequences"]:
+            consequences = self._safe_json_loads(arch["consequences"])
+            if consequences:
+                content += "### Consequences\n"
+                if isinstance(consequences, dict):
+                    for key, value in consequences.items():
+                        content += f"**{key.title()}**: {value}\n"
+                else:
+                    content += f"{consequences}\n"
                 content += "\n"
 
-            content += "---\n\n"
+        # Get linked requirements
+        linked_reqs = self.db.execute_query(
+            """
+            SELECT r.id, r.title FROM requirements r
+            JOIN requirement_architecture ra ON r.id = ra.requirement_id
+            WHERE ra.architecture_id = ?
+        """,
+            [arch["id"]],
+            fetch_all=True,
+        )
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(content)
+        if linked_reqs:
+            content += "### Linked Requirements\n"
+            for req in linked_reqs:
+                content += f"- {req['id']}: {req['title']}\n"
+            content += "\n"
 
-        return [filename]
+        content += "---\n\n"
+
+        return content
 
     def _create_architectural_diagrams(self, **params) -> list[TextContent]:
         """Generate Mermaid diagrams for project architecture"""
@@ -435,7 +442,6 @@ class ExportHandler(BaseHandler):
                 f"SELECT * FROM requirements WHERE id IN ({placeholders}) ORDER BY type, requirement_number",
                 requirement_ids,
                 fetch_all=True,
-                row_factory=True,
             )
         else:
             requirements = self.db.get_records("requirements", "*", order_by="type, requirement_number")
@@ -492,7 +498,6 @@ class ExportHandler(BaseHandler):
             """,
                 requirement_ids,
                 fetch_all=True,
-                row_factory=True,
             )
         else:
             tasks = self.db.get_records("tasks", "*", order_by="task_number, subtask_number")
@@ -538,7 +543,6 @@ class ExportHandler(BaseHandler):
             """,
                 requirement_ids,
                 fetch_all=True,
-                row_factory=True,
             )
         else:
             architecture = self.db.get_records("architecture", "*", order_by="created_at DESC")
@@ -573,7 +577,6 @@ class ExportHandler(BaseHandler):
                 f"SELECT * FROM requirements WHERE id IN ({placeholders}) ORDER BY type, requirement_number",
                 requirement_ids,
                 fetch_all=True,
-                row_factory=True,
             )
             tasks = self.db.execute_query(
                 f"""
@@ -584,7 +587,6 @@ class ExportHandler(BaseHandler):
             """,
                 requirement_ids,
                 fetch_all=True,
-                row_factory=True,
             )
             architecture = self.db.execute_query(
                 f"""
@@ -595,7 +597,6 @@ class ExportHandler(BaseHandler):
             """,
                 requirement_ids,
                 fetch_all=True,
-                row_factory=True,
             )
         else:
             requirements = self.db.get_records("requirements", "*", order_by="type, requirement_number")
@@ -637,7 +638,6 @@ class ExportHandler(BaseHandler):
                 LIMIT 20
             """,
                 fetch_all=True,
-                row_factory=True,
             )
 
             for rt in req_tasks:
@@ -670,7 +670,6 @@ class ExportHandler(BaseHandler):
             """,
                 requirement_ids,
                 fetch_all=True,
-                row_factory=True,
             )
 
             task_ids = [row["task_id"] for row in task_ids_query]
@@ -687,7 +686,6 @@ class ExportHandler(BaseHandler):
                 """,
                     task_ids + task_ids,
                     fetch_all=True,
-                    row_factory=True,
                 )
             else:
                 dependencies = []
@@ -700,7 +698,6 @@ class ExportHandler(BaseHandler):
                 JOIN tasks t2 ON td.depends_on_task_id = t2.id
             """,
                 fetch_all=True,
-                row_factory=True,
             )
 
         if not dependencies:
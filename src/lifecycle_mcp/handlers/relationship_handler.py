@@ -145,13 +145,15 @@ class RelationshipHandler(BaseHandler):
                 f"Relationship already exists: {source_id} -> {target_id} ({rel_type})"
             )
 
-        # Create the relationship in appropriate table
-        success = self._insert_relationship(source_id, target_id, source_type, target_type, rel_type)
+        # Create the relationship and log it in one commit
+        with self.db.transaction(writable=True):
+            success = self._insert_relationship(source_id, target_id, source_type, target_type, rel_type)
 
-        if success:
-            # Log the operation
-            self._log_operation("relationship", f"{source_id}-{target_id}", "created")
+            if success:
+                # Log the operation
+                self._log_operation("relationship", f"{source_id}-{target_id}", "created")
 
+        if success:
             return self._create_above_fold_response(
                 "SUCCESS",
                 f"Relationship created: {source_id} -> {target_id}",
@@ -177,13 +179,15 @@ class RelationshipHandler(BaseHandler):
         if not source_type or not target_type:
             return self._create_error_response(f"Invalid entity IDs: {source_id}, {target_id}")
 
-        # Delete the relationship
-        deleted_count = self._delete_relationship_record(source_id, target_id, source_type, target_type, rel_type)
+        # Delete the relationship and log it in one commit
+        with self.db.transaction(writable=True):
+            deleted_count = self._delete_relationship_record(source_id, target_id, source_type, target_type, rel_type)
 
-        if deleted_count > 0:
-            # Log the operation
-            self._log_operation("relationship", f"{source_id}-{target_id}", "deleted")
+            if deleted_count > 0:
+                # Log the operation
+                self._log_operation("relationship", f"{source_id}-{target_id}", "deleted")
 
+        if deleted_count > 0:
             return self._create_above_fold_response(
                 "SUCCESS",
                 f"Deleted {deleted_count} relationship(s): {source_id} -> {target_id}",
@@ -294,14 +298,12 @@ class RelationshipHandler(BaseHandler):
         if not source_type or not target_type:
             return False
 
-        # Check unified relationships table
-        results = self.db.get_records(
+        # Check unified relationships table; EXISTS stops at the first match
+        return self.db.check_exists(
             "relationships",
-            "1",
             "source_type = ? AND source_id = ? AND target_type = ? AND target_id = ? AND relationship_type = ?",
             [source_type, source_id, target_type, target_id, rel_type]
         )
-        return len(results) > 0
 
     def _insert_relationship(self, source_id: str, target_id: str, source_type: str, target_type: str, rel_type: str) -> bool:
         """Insert relationship into unified relationships table"""
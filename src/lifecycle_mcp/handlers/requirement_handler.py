@@ -4,133 +4,268 @@ Requirement Handler for MCP Lifecycle Management Server
 Handles all requirement-related operations
 """
 
+import hashlib
 import json
+from collections import OrderedDict
+from contextlib import suppress
 from typing import Any
 
 from mcp.types import TextContent
 
 from .base_handler import BaseHandler
 
+# Static tool schemas, built once and shared by every get_tool_definitions call
+_TOOL_DEFINITIONS: list[dict[str, Any]] = [
+    {
+        "name": "create_requirement",
+        "description": "Create a new requirement from interview data",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "type": {"type": "string", "enum": ["FUNC", "NFUNC", "TECH", "BUS", "INTF"]},
+                "title": {"type": "string"},
+                "priority": {"type": "string", "enum": ["P0", "P1", "P2", "P3"]},
+                "current_state": {"type": "string"},
+                "desired_state": {"type": "string"},
+                "functional_requirements": {"type": "array", "items": {"type": "string"}},
+                "acceptance_criteria": {"type": "array", "items": {"type": "string"}},
+                "business_value": {"type": "string"},
+                "risk_level": {"type": "string", "enum": ["High", "Medium", "Low"]},
+                "author": {"type": "string"},
+            },
+            "required": ["type", "title", "priority", "current_state", "desired_state"],
+        },
+    },
+    {
+        "name": "update_requirement_status",
+        "description": "Move requirement through lifecycle states",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "requirement_id": {"type": "string"},
+                "new_status": {
+                    "type": "string",
+                    "enum": [
+                        "Draft",
+                        "Under Review",
+                        "Approved",
+                        "Architecture",
+                        "Ready",
+                        "Implemented",
+                        "Validated",
+                        "Deprecated",
+                    ],
+                },
+                "comment": {"type": "string"},
+            },
+            "required": ["requirement_id", "new_status"],
+        },
+    },
+    {
+        "name": "query_requirements",
+        "description": "Search and filter requirements",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "status": {"type": "string"},
+                "priority": {"type": "string"},
+                "type": {"type": "string"},
+                "search_text": {"type": "string"},
+                "limit": {"type": "integer", "minimum": 1},
+                "offset": {"type": "integer", "minimum": 0},
+            },
+        },
+    },
+    {
+        "name": "query_requirements_json",
+        "description": "Query requirements and return structured JSON data for UI",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "status": {"type": "string"},
+                "priority": {"type": "string"},
+                "type": {"type": "string"},
+                "search_text": {"type": "string"},
+            },
+        },
+    },
+    {
+        "name": "get_requirement_details",
+        "description": "Get full requirement with all relationships",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"requirement_id": {"type": "string"}},
+            "required": ["requirement_id"],
+        },
+    },
+    {
+        "name": "trace_requirement",
+        "description": "Trace requirement through implementation",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"requirement_id": {"type": "string"}},
+            "required": ["requirement_id"],
+        },
+    },
+]
+
+# Fixed query texts, so every call hits the connection's prepared-statement cache
+_INCOMPLETE_TASKS_SQL = """
+    SELECT t.id, t.title, t.status FROM tasks t
+    JOIN requirement_tasks rt ON t.id = rt.task_id
+    WHERE rt.requirement_id = ? AND t.status != 'Complete'
+"""
+
+_LINKED_TASKS_SQL = """
+    SELECT t.id, t.title, t.status FROM tasks t
+    JOIN requirement_tasks rt ON t.id = rt.task_id
+    WHERE rt.requirement_id = ?
+"""
+
+# Report returned after a requirement is automatically decomposed
+_DECOMPOSITION_TEMPLATE = """# Automatic Requirement Decomposition Complete
+
+## Parent Requirement Created
+- **{parent_req_id}**: {title} (Parent)
+
+## Sub-Requirements Created ({count})
+{children_md}
+## Decomposition Analysis
+- **Complexity Score**: {complexity}/10
+- **Scope Assessment**: {scope}
+- **Implementation Focus**: {focus}
+
+## Next Steps
+- Use `trace_requirement` on {parent_req_id} to see full decomposition
+- Create tasks for individual sub-requirements
+- Each sub-requirement can be implemented independently
+"""
+
+# A requirement plus its parents, children (and their summed task counts),
+# tasks and architecture decisions, tagged by kind; unused columns are NULL.
+# _iter_trace_report unpacks rows positionally, so keep the column order.
+_TRACE_SQL = """
+    SELECT 'requirement' AS kind, r.id, r.title, r.status, r.priority, r.created_at,
+           r.tasks_completed, r.task_count, r.current_state, r.desired_state,
+           NULL AS assignee, NULL AS sort_major, NULL AS sort_minor
+    FROM requirements r
+    WHERE r.id = :requirement_id
+    UNION ALL
+    SELECT 'parent', r.id, r.title, r.status, r.priority, r.created_at,
+           r.tasks_completed, r.task_count, NULL, NULL, NULL, NULL, NULL
+    FROM requirements r
+    JOIN requirement_dependencies rd ON r.id = rd.depends_on_requirement_id
+    WHERE rd.requirement_id = :requirement_id AND rd.dependency_type = 'parent'
+    UNION ALL
+    SELECT 'child', r.id, r.title, r.status, r.priority, r.created_at,
+           r.tasks_completed, r.task_count, NULL, NULL, NULL, r.created_at, NULL
+    FROM requirements r
+    JOIN requirement_dependencies rd ON r.id = rd.requirement_id
+    WHERE rd.depends_on_requirement_id = :requirement_id AND rd.dependency_type = 'parent'
+    UNION ALL
+    SELECT 'child_total', NULL, NULL, NULL, NULL, NULL,
+           SUM(r.tasks_completed), SUM(r.task_count), NULL, NULL, NULL, NULL, NULL
+    FROM requirements r
+    JOIN requirement_dependencies rd ON r.id = rd.requirement_id
+    WHERE rd.depends_on_requirement_id = :requirement_id AND rd.dependency_type = 'parent'
+    UNION ALL
+    SELECT 'task', t.id, t.title, t.status, NULL, NULL,
+           NULL, NULL, NULL, NULL, t.assignee, t.task_number, t.subtask_number
+    FROM tasks t
+    JOIN requirement_tasks rt ON t.id = rt.task_id
+    WHERE rt.requirement_id = :requirement_id
+    UNION ALL
+    SELECT 'architecture', a.id, a.title, a.status, NULL, NULL,
+           NULL, NULL, NULL, NULL, NULL, NULL, NULL
+    FROM architecture a
+    JOIN requirement_architecture ra ON a.id = ra.architecture_id
+    WHERE ra.requirement_id = :requirement_id
+    ORDER BY kind, sort_major, sort_minor
+"""
+
+# Requirement columns rendered by get_requirement_details
+_DETAIL_COLUMNS = (
+    "id, title, type, status, priority, risk_level, author, created_at, updated_at, "
+    "current_state, desired_state, business_value, functional_requirements, acceptance_criteria"
+)
+
+# Exact-match query filters: parameter name -> WHERE fragment
+_EQUALITY_FILTERS = (
+    ("status", "status = ?"),
+    ("priority", "priority = ?"),
+    ("type", "type = ?"),
+)
+
+# Shared result for statuses with no outgoing transitions
+_NO_TRANSITIONS: frozenset[str] = frozenset()
+
 
 class RequirementHandler(BaseHandler):
     """Handler for requirement-related MCP tools"""
 
+    # Allowed requirement lifecycle moves: current status -> next statuses
+    _VALID_TRANSITIONS: dict[str, frozenset[str]] = {
+        "Draft": frozenset({"Under Review", "Deprecated"}),
+        "Under Review": frozenset({"Draft", "Approved", "Deprecated"}),
+        "Approved": frozenset({"Architecture", "Ready", "Deprecated"}),
+        "Architecture": frozenset({"Ready", "Approved"}),
+        "Ready": frozenset({"Implemented", "Deprecated"}),
+        "Implemented": frozenset({"Validated", "Ready"}),
+        "Validated": frozenset({"Deprecated"}),
+        "Deprecated": _NO_TRANSITIONS,
+    }
+
+    # Rendered requirement details kept for repeat get_requirement_details calls
+    _DETAIL_CACHE_SIZE = 128
+
+    # LLM analyses kept for repeat submissions of the same requirement text
+    _ANALYSIS_CACHE_SIZE = 256
+
+    # Requirements under these limits are created without asking the LLM
+    _TRIVIAL_TEXT_LENGTH = 400
+    _TRIVIAL_MAX_ITEMS = 3
+    _SCOPE_CONJUNCTIONS = frozenset({"and", "also", "plus"})
+
     def __init__(self, db_manager, mcp_client=None):
         """Initialize handler with database manager and optional MCP client"""
         super().__init__(db_manager)
         self.mcp_client = mcp_client
 
+        # requirement id -> (updated_at, rendered report, action line)
+        self._detail_cache: OrderedDict[str, tuple[str, str, str]] = OrderedDict()
+
+        # normalized requirement context hash -> parsed LLM analysis
+        self._analysis_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+        # tool name -> (method, is_async); async-ness is fixed per method
+        self._dispatch = {
+            "create_requirement": (self._create_requirement, True),
+            "update_requirement_status": (self._update_requirement_status, True),
+            "query_requirements": (self._query_requirements, False),
+            "query_requirements_json": (self._query_requirements_json, False),
+            "get_requirement_details": (self._get_requirement_details, False),
+            "trace_requirement": (self._trace_requirement, False),
+        }
+
     def get_tool_definitions(self) -> list[dict[str, Any]]:
-        """Return requirement tool definitions"""
-        return [
-            {
-                "name": "create_requirement",
-                "description": "Create a new requirement from interview data",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "type": {"type": "string", "enum": ["FUNC", "NFUNC", "TECH", "BUS", "INTF"]},
-                        "title": {"type": "string"},
-                        "priority": {"type": "string", "enum": ["P0", "P1", "P2", "P3"]},
-                        "current_state": {"type": "string"},
-                        "desired_state": {"type": "string"},
-                        "functional_requirements": {"type": "array", "items": {"type": "string"}},
-                        "acceptance_criteria": {"type": "array", "items": {"type": "string"}},
-                        "business_value": {"type": "string"},
-                        "risk_level": {"type": "string", "enum": ["High", "Medium", "Low"]},
-                        "author": {"type": "string"},
-                    },
-                    "required": ["type", "title", "priority", "current_state", "desired_state"],
-                },
-            },
-            {
-                "name": "update_requirement_status",
-                "description": "Move requirement through lifecycle states",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "requirement_id": {"type": "string"},
-                        "new_status": {
-                            "type": "string",
-                            "enum": [
-                                "Draft",
-                                "Under Review",
-                                "Approved",
-                                "Architecture",
-                                "Ready",
-                                "Implemented",
-                                "Validated",
-                                "Deprecated",
-                            ],
-                        },
-                        "comment": {"type": "string"},
-                    },
-                    "required": ["requirement_id", "new_status"],
-                },
-            },
-            {
-                "name": "query_requirements",
-                "description": "Search and filter requirements",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "status": {"type": "string"},
-                        "priority": {"type": "string"},
-                        "type": {"type": "string"},
-                        "search_text": {"type": "string"},
-                    },
-                },
-            },
-            {
-                "name": "query_requirements_json",
-                "description": "Query requirements and return structured JSON data for UI",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "status": {"type": "string"},
-                        "priority": {"type": "string"},
-                        "type": {"type": "string"},
-                        "search_text": {"type": "string"},
-                    },
-                },
-            },
-            {
-                "name": "get_requirement_details",
-                "description": "Get full requirement with all relationships",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {"requirement_id": {"type": "string"}},
-                    "required": ["requirement_id"],
-                },
-            },
-            {
-                "name": "trace_requirement",
-                "description": "Trace requirement through implementation",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {"requirement_id": {"type": "string"}},
-                    "required": ["requirement_id"],
-                },
-            },
-        ]
+        """Return requirement tool definitions
+
+        The list is shared across calls; callers must treat it as read-only.
+        """
+        return _TOOL_DEFINITIONS
 
     async def handle_tool_call(self, tool_name: str, arguments: dict[str, Any]) -> list[TextContent]:
         """Route tool calls to appropriate handler methods"""
+        entry = self._dispatch.get(tool_name)
+        if entry is None:
+            return self._create_error_response(f"Unknown tool: {tool_name}")
+
+        method, is_async = entry
         try:
-            if tool_name == "create_requirement":
-                return await self._create_requirement(**arguments)
-            elif tool_name == "update_requirement_status":
-                return await self._update_requirement_status(**arguments)
-            elif tool_name == "query_requirements":
-                return self._query_requirements(**arguments)
-            elif tool_name == "query_requirements_json":
-                return self._query_requirements_json(**arguments)
-            elif tool_name == "get_requirement_details":
-                return self._get_requirement_details(**arguments)
-            elif tool_name == "trace_requirement":
-                return self._trace_requirement(**arguments)
-            else:
-                return self._create_error_response(f"Unknown tool: {tool_name}")
+            if is_async:
+                return await method(**arguments)
+            # SQLite calls block, so synchronous tools run off the event loop
+            return await self._run_db(method, **arguments)
         except Exception as e:
             return self._create_error_response(f"Error handling {tool_name}", e)
 
@@ -142,9 +277,16 @@ class RequirementHandler(BaseHandler):
             return self._create_error_response(error)
 
         try:
-            # Perform LLM analysis for requirement decomposition
-            llm_analysis = await self._analyze_requirement_with_llm(params)
             analysis_warning = ""
+            if self._is_trivially_single(params):
+                # Small, single-feature requirements never warrant decomposition
+                self.logger.info("Skipping LLM analysis for trivially scoped requirement")
+                llm_analysis = None
+            else:
+                # Perform LLM analysis for requirement decomposition
+                llm_analysis = await self._analyze_requirement_with_llm(params)
+                if not llm_analysis:
+                    analysis_warning = "\n⚠️  LLM analysis not available - proceeding with standard creation"
 
             # Handle LLM analysis results
             if llm_analysis:
@@ -154,11 +296,9 @@ class RequirementHandler(BaseHandler):
                 elif llm_analysis.get("recommendation") == "decompose":
                     # Automatically create decomposed requirements
                     return await self._create_decomposed_requirements(llm_analysis, params)
-            else:
-                analysis_warning = "\n⚠️  LLM analysis not available - proceeding with standard creation"
 
             # Standard requirement creation (single requirement)
-            req_id = self._create_single_requirement(params)
+            req_id = await self._run_db(self._create_single_requirement, params)
 
             # Create above-the-fold response
             key_info = f"Requirement {req_id} created"
@@ -180,10 +320,30 @@ class RequirementHandler(BaseHandler):
             self.logger.info("No MCP client available for sampling - using fallback requirement creation")
             return None
 
+        # Check sampling capability before building the context and request
+        streaming = callable(getattr(self.mcp_client, "sample_stream", None))
+        if not streaming and not callable(getattr(self.mcp_client, "sample", None)):
+            self.logger.info("MCP client does not support sampling - using fallback requirement creation")
+            return None
+
         try:
             # Build context for LLM analysis
             requirement_context = self._build_requirement_context(params)
 
+            # Resubmitting the same requirement reuses the earlier analysis
+            cache_key = self._analysis_cache_key(requirement_context)
+            cached = self._analysis_cache.get(cache_key)
+            if cached is not None:
+                with suppress(KeyError):
+                    self._analysis_cache.move_to_end(cache_key)
+                return cached
+
+            # Earlier processes may have analyzed it already
+            stored = await self._run_db(self._load_stored_analysis, cache_key)
+            if stored is not None:
+                self._remember_analysis(cache_key, stored)
+                return stored
+
             # Prepare LLM sampling request
             sampling_request = {
                 "messages": [{"role": "user", "content": {"type": "text", "text": requirement_context}}],
@@ -195,28 +355,113 @@ class RequirementHandler(BaseHandler):
                 "stopSequences": ["```"],
             }
 
-            # Check if the MCP client has sampling capability
-            if hasattr(self.mcp_client, "sample") and callable(self.mcp_client.sample):
+            # Prefer streaming so generation can stop as soon as the JSON is complete
+            if streaming:
+                try:
+                    analysis = await self._sample_analysis_streaming(sampling_request)
+                except Exception as sampling_error:
+                    self.logger.warning(f"MCP streaming sampling failed: {sampling_error}")
+                    return None
+            else:
                 try:
                     # Make the actual MCP sampling request
                     response = await self.mcp_client.sample(sampling_request)
                     if response and hasattr(response, "content") and hasattr(response.content, "text"):
-                        return json.loads(response.content.text)
+                        analysis = json.loads(response.content.text)
                     else:
                         self.logger.warning("MCP sampling returned invalid response format")
                         return None
                 except Exception as sampling_error:
                     self.logger.warning(f"MCP sampling failed: {sampling_error}")
                     return None
-            else:
-                self.logger.info("MCP client does not support sampling - using fallback requirement creation")
-                return None
+
+            self._remember_analysis(cache_key, analysis)
+            await self._run_db(self._store_analysis, cache_key, analysis)
+            return analysis
 
         except Exception as e:
             # Log error but don't fail requirement creation
             self.logger.warning(f"LLM analysis failed: {e}")
             return None
 
+    async def _sample_analysis_streaming(self, sampling_request: dict[str, Any]) -> dict[str, Any]:
+        """Read a streamed sampling response only until a complete JSON object has arrived
+
+        The client's sample_stream yields text chunks. Once the analysis
+        object parses, the stream is closed so the rest of the generation
+        is abandoned. Raises if the stream ends without valid JSON.
+        """
+        decoder = json.JSONDecoder()
+        text = ""
+        stream = self.mcp_client.sample_stream(sampling_request)
+        try:
+            async for chunk in stream:
+                text += chunk
+                start = text.find("{")
+                if "}" not in chunk or start < 0:
+                    continue
+                try:
+                    analysis, _ = decoder.raw_decode(text, start)
+                except json.JSONDecodeError:
+                    continue
+                return analysis
+        finally:
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+        return json.loads(text)
+
+    def _is_trivially_single(self, params: dict[str, Any]) -> bool:
+        """Whether a requirement is too small to need decomposition analysis
+
+        Short text, few functional requirements and a title that does not join
+        several features mark the requirement as a single, self-contained one.
+        """
+        text_length = len(params["title"]) + len(params["current_state"]) + len(params["desired_state"])
+        if text_length >= self._TRIVIAL_TEXT_LENGTH:
+            return False
+        if len(params.get("functional_requirements") or []) > self._TRIVIAL_MAX_ITEMS:
+            return False
+        return self._SCOPE_CONJUNCTIONS.isdisjoint(params["title"].casefold().split())
+
+    @staticmethod
+    def _analysis_cache_key(requirement_context: str) -> str:
+        """Hash the requirement context, ignoring case and whitespace differences"""
+        normalized = " ".join(requirement_context.casefold().split())
+        return hashlib.blake2b(normalized.encode(), digest_size=32).hexdigest()
+
+    def _remember_analysis(self, cache_key: str, analysis: dict[str, Any]):
+        """Add an analysis to the in-memory LRU"""
+        self._analysis_cache[cache_key] = analysis
+        if len(self._analysis_cache) > self._ANALYSIS_CACHE_SIZE:
+            with suppress(KeyError):
+                self._analysis_cache.popitem(last=False)
+
+    def _load_stored_analysis(self, cache_key: str) -> dict[str, Any] | None:
+        """Return a persisted analysis for the key, or None"""
+        try:
+            row = self.db.execute_query(
+                "SELECT response_json FROM requirement_analysis_cache WHERE key = ?", [cache_key], fetch_one=True
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to read analysis cache: {e}")
+            return None
+        if row is None:
+            return None
+        analysis = self._safe_json_loads(row[0])
+        return analysis if isinstance(analysis, dict) else None
+
+    def _store_analysis(self, cache_key: str, analysis: dict[str, Any]):
+        """Persist an analysis so later processes can reuse it"""
+        try:
+            self.db.execute_query(
+                "INSERT OR REPLACE INTO requirement_analysis_cache (key, response_json) VALUES (?, ?)",
+                [cache_key, self._safe_json_dumps(analysis)],
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to store analysis: {e}")
+
     def _build_requirement_context(self, params: dict[str, Any]) -> str:
         """Build context string for LLM analysis"""
         context = f"""Analyze this requirement for decomposition and clarity:
@@ -281,17 +526,16 @@ Guidelines:
         """Format list items for context"""
         if not items:
             return "- None specified"
-        return "\n".join(f"- {item}" for item in items)
+        return "- " + "\n- ".join(map(str, items))
 
     def _create_clarification_response(self, analysis: dict[str, Any]) -> list[TextContent]:
         """Create response with clarifying questions"""
         questions = analysis.get("clarifying_questions", [])[:3]  # Limit to 3 questions
 
-        response = "The requirement needs additional clarification. Please answer these questions:\n\n"
-        for i, q in enumerate(questions, 1):
-            response += f"{i}. {q['question']} (Purpose: {q['purpose']})\n"
-
-        response += "\nOnce you provide answers, I can create a properly scoped requirement."
+        parts = ["The requirement needs additional clarification. Please answer these questions:\n\n"]
+        parts.extend(f"{i}. {q['question']} (Purpose: {q['purpose']})\n" for i, q in enumerate(questions, 1))
+        parts.append("\nOnce you provide answers, I can create a properly scoped requirement.")
+        response = "".join(parts)
 
         # Create above-the-fold response for clarification
         key_info = "Requirement needs clarification"
@@ -304,28 +548,45 @@ Guidelines:
         """Create response with decomposition suggestions"""
         suggestions = analysis.get("decomposition", {}).get("suggested_sub_requirements", [])
 
-        response = f"The requirement '{original_params['title']}' should be decomposed into smaller requirements:\n\n"
-
-        for i, suggestion in enumerate(suggestions, 1):
-            response += f"{i}. **{suggestion['title']}** ({suggestion['type']})\n"
-            response += f"   Rationale: {suggestion['rationale']}\n\n"
-
-        response += "Would you like me to create these individual requirements instead?"
+        parts = [f"The requirement '{original_params['title']}' should be decomposed into smaller requirements:\n\n"]
+        parts.extend(
+            f"{i}. **{suggestion['title']}** ({suggestion['type']})\n   Rationale: {suggestion['rationale']}\n\n"
+            for i, suggestion in enumerate(suggestions, 1)
+        )
+        parts.append("Would you like me to create these individual requirements instead?")
+        response = "".join(parts)
 
         # Create above-the-fold response for decomposition
         key_info = "Requirement should be decomposed"
         action_info = f"🔄 {len(suggestions)} sub-requirements suggested | Complex scope detected"
         return self._create_above_fold_response("INFO", key_info, action_info, response)
 
-    def _create_single_requirement(self, params: dict[str, Any]) -> str:
-        """Create a single requirement (extracted from original logic)"""
-        # Get next requirement number
-        req_number = self.db.get_next_id("requirements", "requirement_number", "type = ?", [params["type"]])
-        req_id = f"REQ-{req_number:04d}-{params['type']}-00"
+    def _create_single_requirement(self, params: dict[str, Any], req_number: int | None = None) -> str:
+        """Create a single requirement (extracted from original logic)
+
+        Pass req_number when the caller has already reserved the number.
+        """
+        # Number allocation and insert share one write transaction so two
+        # concurrent creates cannot read the same MAX()
+        with self.db.transaction(writable=True):
+            # Get next requirement number
+            if req_number is None:
+                req_number = self.db.get_next_id("requirements", "requirement_number", "type = ?", [params["type"]])
+            req_data = self._build_requirement_row(params, req_number)
+            req_id = req_data["id"]
+
+            # Insert requirement
+            self.db.insert_record("requirements", req_data)
+
+            # Log event
+            self._log_operation("requirement", req_id, "created", params.get("author", "MCP User"))
 
-        # Prepare requirement data
-        req_data = {
-            "id": req_id,
+        return req_id
+
+    def _build_requirement_row(self, params: dict[str, Any], req_number: int) -> dict[str, Any]:
+        """Build the requirements table row for a new requirement"""
+        return {
+            "id": f"REQ-{req_number:04d}-{params['type']}-00",
             "requirement_number": req_number,
             "type": params["type"],
             "version": 0,
@@ -340,14 +601,6 @@ Guidelines:
             "risk_level": params.get("risk_level", "Medium"),
         }
 
-        # Insert requirement
-        self.db.insert_record("requirements", req_data)
-
-        # Log event
-        self._log_operation("requirement", req_id, "created", params.get("author", "MCP User"))
-
-        return req_id
-
     async def _create_decomposed_requirements(
         self, analysis: dict[str, Any], original_params: dict[str, Any]
     ) -> list[TextContent]:
@@ -357,27 +610,79 @@ Guidelines:
 
             if not suggestions:
                 # Fallback to single requirement if no suggestions
-                req_id = self._create_single_requirement(original_params)
+                req_id = await self._run_db(self._create_single_requirement, original_params)
                 key_info = f"Requirement {req_id} created"
                 req_type = original_params["type"]
                 priority = original_params["priority"]
                 action_info = f"📄 {original_params['title']} | {req_type} | {priority}"
                 return self._create_above_fold_response("SUCCESS", key_info, action_info)
 
-            # Create parent requirement first
-            parent_req_id = self._create_single_requirement(
-                {
-                    **original_params,
-                    "title": f"{original_params['title']} (Parent)",
-                    "current_state": f"Parent requirement for: {original_params['current_state']}",
-                    "desired_state": (
-                        f"Decomposed into {len(suggestions)} sub-requirements: {original_params['desired_state']}"
-                    ),
-                }
+            parent_req_id, sub_req_ids = await self._run_db(
+                self._write_decomposition, original_params, suggestions
             )
 
-            # Create sub-requirements
-            sub_req_ids = []
+            # Build comprehensive response
+            children_md = "".join(
+                f"{i}. **{sub_req_id}**: {suggestion['title']} ({suggestion.get('type', original_params['type'])})\n"
+                f"   - Rationale: {suggestion.get('rationale', 'N/A')}\n"
+                for i, (sub_req_id, suggestion) in enumerate(zip(sub_req_ids, suggestions, strict=False), 1)
+            )
+            summary = analysis.get("analysis", {})
+            response = _DECOMPOSITION_TEMPLATE.format(
+                parent_req_id=parent_req_id,
+                title=original_params["title"],
+                count=len(sub_req_ids),
+                children_md=children_md,
+                complexity=summary.get("complexity_score", "N/A"),
+                scope=summary.get("scope_assessment", "N/A"),
+                focus=summary.get("implementation_focus", "N/A"),
+            )
+
+            # Create above-the-fold response
+            key_info = f"Requirement decomposed into {len(sub_req_ids)} sub-requirements"
+            action_info = f"🔄 Parent: {parent_req_id} | {len(sub_req_ids)} children created"
+            return self._create_above_fold_response("SUCCESS", key_info, action_info, response)
+
+        except Exception as e:
+            # Fallback to single requirement creation if decomposition fails
+            self.logger.warning(f"Automatic decomposition failed, creating single requirement: {e}")
+            req_id = await self._run_db(self._create_single_requirement, original_params)
+            key_info = f"Requirement {req_id} created"
+            action_info = f"📄 {original_params['title']} | Decomposition failed, created single requirement"
+            return self._create_above_fold_response("SUCCESS", key_info, action_info)
+
+    def _write_decomposition(
+        self, original_params: dict[str, Any], suggestions: list[dict[str, Any]]
+    ) -> tuple[str, list[str]]:
+        """Create the parent requirement, its sub-requirements and their links; returns their IDs"""
+        # The whole decomposition is written in one transaction. Numbers are
+        # read on the writer once per type and then handed out locally
+        # instead of re-reading MAX() for every insert.
+        with self.db.transaction(writable=True) as cursor:
+            next_numbers: dict[str, int] = {}
+
+            def reserve_number(req_type: str) -> int:
+                if req_type not in next_numbers:
+                    next_numbers[req_type] = self.db.get_next_id(
+                        "requirements", "requirement_number", "type = ?", [req_type]
+                    )
+                number = next_numbers[req_type]
+                next_numbers[req_type] = number + 1
+                return number
+
+            # Create parent requirement first
+            parent_params = {
+                **original_params,
+                "title": f"{original_params['title']} (Parent)",
+                "current_state": f"Parent requirement for: {original_params['current_state']}",
+                "desired_state": (
+                    f"Decomposed into {len(suggestions)} sub-requirements: {original_params['desired_state']}"
+                ),
+            }
+            parent_req_id = self._create_single_requirement(parent_params, reserve_number(parent_params["type"]))
+
+            # Create sub-requirements; rows share one shape, so they go in with a single executemany
+            sub_req_rows = []
             for i, suggestion in enumerate(suggestions, 1):
                 # Create sub-requirement with decomposed content
                 sub_req_data = {
@@ -396,72 +701,42 @@ Guidelines:
                     "acceptance_criteria": original_params.get("acceptance_criteria", []),
                 }
 
-                sub_req_id = self._create_single_requirement(sub_req_data)
-                sub_req_ids.append(sub_req_id)
-
-                # Create parent-child relationship
-                self._create_requirement_dependency(sub_req_id, parent_req_id, "parent")
+                sub_req_rows.append(self._build_requirement_row(sub_req_data, reserve_number(sub_req_data["type"])))
 
-            # Build comprehensive response
-            response = f"""# Automatic Requirement Decomposition Complete
+            self.db.insert_many("requirements", sub_req_rows)
+            sub_req_ids = [row["id"] for row in sub_req_rows]
+            self._log_operations("requirement", sub_req_ids, "created", original_params.get("author", "MCP User"))
 
-## Parent Requirement Created
-- **{parent_req_id}**: {original_params["title"]} (Parent)
+            # Create parent-child relationships in one statement
+            self._create_requirement_dependencies(cursor, sub_req_ids, parent_req_id, "parent")
 
-## Sub-Requirements Created ({len(sub_req_ids)})
-"""
-            for i, (sub_req_id, suggestion) in enumerate(zip(sub_req_ids, suggestions, strict=False), 1):
-                req_type = suggestion.get("type", original_params["type"])
-                response += f"{i}. **{sub_req_id}**: {suggestion['title']} ({req_type})\n"
-                response += f"   - Rationale: {suggestion.get('rationale', 'N/A')}\n"
+        return parent_req_id, sub_req_ids
 
-            response += f"""
-## Decomposition Analysis
-- **Complexity Score**: {analysis.get("analysis", {}).get("complexity_score", "N/A")}/10
-- **Scope Assessment**: {analysis.get("analysis", {}).get("scope_assessment", "N/A")}
-- **Implementation Focus**: {analysis.get("analysis", {}).get("implementation_focus", "N/A")}
-
-## Next Steps
-- Use `trace_requirement` on {parent_req_id} to see full decomposition
-- Create tasks for individual sub-requirements
-- Each sub-requirement can be implemented independently
-"""
-
-            # Create above-the-fold response
-            key_info = f"Requirement decomposed into {len(sub_req_ids)} sub-requirements"
-            action_info = f"🔄 Parent: {parent_req_id} | {len(sub_req_ids)} children created"
-            return self._create_above_fold_response("SUCCESS", key_info, action_info, response)
-
-        except Exception as e:
-            # Fallback to single requirement creation if decomposition fails
-            self.logger.warning(f"Automatic decomposition failed, creating single requirement: {e}")
-            req_id = self._create_single_requirement(original_params)
-            key_info = f"Requirement {req_id} created"
-            action_info = f"📄 {original_params['title']} | Decomposition failed, created single requirement"
-            return self._create_above_fold_response("SUCCESS", key_info, action_info)
-
-    def _create_requirement_dependency(self, requirement_id: str, depends_on_id: str, dependency_type: str):
-        """Create a requirement dependency relationship"""
+    def _create_requirement_dependencies(
+        self, cursor, requirement_ids: list[str], depends_on_id: str, dependency_type: str
+    ):
+        """Create dependency relationships from several requirements to one requirement"""
         try:
-            self.db.insert_record(
-                "requirement_dependencies",
-                {
-                    "requirement_id": requirement_id,
-                    "depends_on_requirement_id": depends_on_id,
-                    "dependency_type": dependency_type,
-                },
+            cursor.executemany(
+                "INSERT INTO requirement_dependencies (requirement_id, depends_on_requirement_id, dependency_type) "
+                "VALUES (?, ?, ?)",
+                [(requirement_id, depends_on_id, dependency_type) for requirement_id in requirement_ids],
             )
-            self._log_operation(
+            self._log_operations(
                 "requirement_dependency",
-                requirement_id,
+                requirement_ids,
                 f"created_{dependency_type}_relationship",
                 f"Linked to {depends_on_id}",
             )
         except Exception as e:
-            self.logger.error(f"Failed to create requirement dependency: {e}")
+            self.logger.error(f"Failed to create requirement dependencies: {e}")
 
     async def _update_requirement_status(self, **params) -> list[TextContent]:
         """Update requirement status with validation"""
+        return await self._run_db(self._apply_requirement_status_update, **params)
+
+    def _apply_requirement_status_update(self, **params) -> list[TextContent]:
+        """Validate and apply a requirement status change (blocking database work)"""
         # Validate required parameters
         error = self._validate_required_params(params, ["requirement_id", "new_status"])
         if error:
@@ -479,16 +754,8 @@ Guidelines:
 
             # Validate task completion before allowing Validated status
             if new_status == "Validated":
-                incomplete_tasks = self.db.execute_query(
-                    """
-                    SELECT t.id, t.title, t.status FROM tasks t
-                    JOIN requirement_tasks rt ON t.id = rt.task_id
-                    WHERE rt.requirement_id = ? AND t.status != 'Complete'
-                """,
-                    [params["requirement_id"]],
-                    fetch_all=True,
-                    row_factory=True,
-                )
+                requirement_id = params["requirement_id"]
+                incomplete_tasks = self.db.execute_query(_INCOMPLETE_TASKS_SQL, [requirement_id], fetch_all=True)
 
                 if incomplete_tasks:
                     task_list = "\n".join(
@@ -502,31 +769,25 @@ Guidelines:
                     return self._create_error_response(error_msg)
 
             # Validate state transition
-            valid_transitions = {
-                "Draft": ["Under Review", "Deprecated"],
-                "Under Review": ["Draft", "Approved", "Deprecated"],
-                "Approved": ["Architecture", "Ready", "Deprecated"],
-                "Architecture": ["Ready", "Approved"],
-                "Ready": ["Implemented", "Deprecated"],
-                "Implemented": ["Validated", "Ready"],
-                "Validated": ["Deprecated"],
-                "Deprecated": [],
-            }
-
-            if new_status not in valid_transitions.get(current_status, []):
+            if new_status not in self._VALID_TRANSITIONS.get(current_status, _NO_TRANSITIONS):
                 return self._create_error_response(f"Invalid transition from {current_status} to {new_status}")
 
-            # Update status
-            self.db.update_record(
-                "requirements",
-                {"status": new_status, "updated_at": "CURRENT_TIMESTAMP"},
-                "id = ?",
-                [params["requirement_id"]],
-            )
+            # Status change and review comment are committed together
+            with self.db.transaction(writable=True):
+                # Update status
+                self.db.update_record(
+                    "requirements",
+                    {"status": new_status, "updated_at": "CURRENT_TIMESTAMP"},
+                    "id = ?",
+                    [params["requirement_id"]],
+                )
 
-            # Add review comment if provided
-            if params.get("comment"):
-                self._add_review_comment("requirement", params["requirement_id"], params["comment"])
+                # Add review comment if provided
+                if params.get("comment"):
+                    self._add_review_comment("requirement", params["requirement_id"], params["comment"])
+
+            # updated_at only has second resolution, so drop the rendered details explicitly
+            self._detail_cache.pop(params["requirement_id"], None)
 
             # Create above-the-fold response
             key_info = f"Requirement {params['requirement_id']} updated"
@@ -537,33 +798,42 @@ Guidelines:
         except Exception as e:
             return self._create_error_response("Failed to update requirement status", e)
 
-    def _query_requirements(self, **params) -> list[TextContent]:
-        """Query requirements with filters"""
-        try:
-            where_clauses = []
-            where_params = []
-
-            if params.get("status"):
-                where_clauses.append("status = ?")
-                where_params.append(params["status"])
+    def _build_requirement_filters(self, params: dict[str, Any]) -> tuple[str, list[Any], list[str]]:
+        """Build the WHERE clause, its parameters and the filter labels for a requirements query"""
+        where_clauses = []
+        where_params = []
+        filters = []
 
-            if params.get("priority"):
-                where_clauses.append("priority = ?")
-                where_params.append(params["priority"])
+        for key, clause in _EQUALITY_FILTERS:
+            value = params.get(key)
+            if value:
+                where_clauses.append(clause)
+                where_params.append(value)
+                filters.append(f"{key}: {value}")
 
-            if params.get("type"):
-                where_clauses.append("type = ?")
-                where_params.append(params["type"])
+        search_text = params.get("search_text")
+        if search_text:
+            where_clauses.append("(title LIKE ? OR desired_state LIKE ?)")
+            search = f"%{search_text}%"
+            where_params.extend([search, search])
+            filters.append(f"search: {search_text}")
 
-            if params.get("search_text"):
-                where_clauses.append("(title LIKE ? OR desired_state LIKE ?)")
-                search = f"%{params['search_text']}%"
-                where_params.extend([search, search])
+        return " AND ".join(where_clauses), where_params, filters
 
-            where_clause = " AND ".join(where_clauses) if where_clauses else ""
+    def _query_requirements(self, **params) -> list[TextContent]:
+        """Query requirements with filters"""
+        try:
+            where_clause, where_params, filters = self._build_requirement_filters(params)
 
+            # Only the listed columns are needed; paging is done by SQLite
             requirements = self.db.get_records(
-                "requirements", "*", where_clause, where_params, "priority, created_at DESC"
+                "requirements",
+                "id, title, status, priority",
+                where_clause,
+                where_params,
+                "priority, created_at DESC",
+                params.get("limit"),
+                offset=params.get("offset"),
             )
 
             if not requirements:
@@ -572,25 +842,12 @@ Guidelines:
                 )
 
             # Build filter description for above-the-fold
-            filters = []
-            if params.get("status"):
-                filters.append(f"status: {params['status']}")
-            if params.get("priority"):
-                filters.append(f"priority: {params['priority']}")
-            if params.get("type"):
-                filters.append(f"type: {params['type']}")
-            if params.get("search_text"):
-                filters.append(f"search: {params['search_text']}")
             filter_desc = " | ".join(filters) if filters else "all requirements"
 
-            # Build detailed list
-            req_list = []
-            for req in requirements:
-                req_info = f"- {req['id']}: {req['title']} [{req['status']}] {req['priority']}"
-                req_list.append(req_info)
-
             key_info = self._format_count_summary("requirement", len(requirements), filter_desc)
-            details = "\n".join(req_list)
+            details = "\n".join(
+                f"- {req['id']}: {req['title']} [{req['status']}] {req['priority']}" for req in requirements
+            )
 
             return self._create_above_fold_response("SUCCESS", key_info, "", details)
 
@@ -600,27 +857,7 @@ Guidelines:
     def _query_requirements_json(self, **params) -> list[TextContent]:
         """Query requirements and return structured JSON data for UI"""
         try:
-            where_clauses = []
-            where_params = []
-
-            if params.get("status"):
-                where_clauses.append("status = ?")
-                where_params.append(params["status"])
-
-            if params.get("priority"):
-                where_clauses.append("priority = ?")
-                where_params.append(params["priority"])
-
-            if params.get("type"):
-                where_clauses.append("type = ?")
-                where_params.append(params["type"])
-
-            if params.get("search_text"):
-                where_clauses.append("(title LIKE ? OR desired_state LIKE ?)")
-                search = f"%{params['search_text']}%"
-                where_params.extend([search, search])
-
-            where_clause = " AND ".join(where_clauses) if where_clauses else ""
+            where_clause, where_params, _ = self._build_requirement_filters(params)
 
             requirements = self.db.get_records(
                 "requirements", "*", where_clause, where_params, "priority, created_at DESC"
@@ -628,10 +865,7 @@ Guidelines:
 
             # Convert database rows to JSON-serializable format
             requirements_list = []
-            for req in requirements:
-                # Convert row object to dictionary and handle any special fields
-                req_dict = dict(req) if hasattr(req, 'keys') else req
-
+            for req_dict in self._rows_to_dicts(requirements):
                 # Parse JSON fields if they exist as strings
                 json_fields = ['functional_requirements', 'acceptance_criteria', 'business_value']
                 for field in json_fields:
@@ -649,24 +883,44 @@ Guidelines:
         except Exception as e:
             return self._create_error_response("Failed to query requirements as JSON", e)
 
-    def _get_requirement_details(self, **params) -> list[TextContent]:
-        """Get full requirement details"""
-        # Validate required parameters
-        error = self._validate_required_params(params, ["requirement_id"])
-        if error:
-            return self._create_error_response(error)
+    def _render_requirement_details(self, requirement_id: str) -> tuple[str, str] | None:
+        """Render the requirement part of the details report, reusing it while updated_at is unchanged
+
+        Linked tasks change independently of the requirement row, so they are
+        always queried fresh by the caller. Returns None if the requirement
+        does not exist.
+        """
+        probe = self.db.execute_query(
+            "SELECT updated_at FROM requirements WHERE id = ?", [requirement_id], fetch_one=True
+        )
+        if probe is None:
+            return None
 
-        try:
-            # Get requirement
-            requirements = self.db.get_records("requirements", "*", "id = ?", [params["requirement_id"]])
+        cached = self._detail_cache.get(requirement_id)
+        if cached is not None and cached[0] == probe[0]:
+            # Tools run in worker threads; another call may have evicted the entry meanwhile
+            with suppress(KeyError):
+                self._detail_cache.move_to_end(requirement_id)
+            return cached[1], cached[2]
 
-            if not requirements:
-                return self._create_error_response("Requirement not found")
+        requirements = self.db.get_records("requirements", _DETAIL_COLUMNS, "id = ?", [requirement_id])
+        if not requirements:
+            return None
 
-            req = requirements[0]
+        req = requirements[0]
+        report = "".join(self._iter_requirement_report(req))
 
-            # Build detailed report
-            report = f"""# Requirement Details: {req["id"]}
+        action_info = f"📄 {req['title']} | {req['status']} | {req['priority']}"
+        self._detail_cache[requirement_id] = (req["updated_at"], report, action_info)
+        if len(self._detail_cache) > self._DETAIL_CACHE_SIZE:
+            with suppress(KeyError):
+                self._detail_cache.popitem(last=False)
+
+        return report, action_info
+
+    def _iter_requirement_report(self, req):
+        """Yield the markdown fragments of a requirement details report"""
+        yield f"""# Requirement Details: {req["id"]}
 
 ## Basic Information
 - **Title**: {req["title"]}
@@ -688,40 +942,44 @@ Guidelines:
 ## Requirements Details
 """
 
-            if req["functional_requirements"]:
-                func_reqs = self._safe_json_loads(req["functional_requirements"])
-                if func_reqs:
-                    report += "### Functional Requirements\n"
-                    for fr in func_reqs:
-                        report += f"- {fr}\n"
+        if req["functional_requirements"]:
+            func_reqs = self._safe_json_loads(req["functional_requirements"])
+            if func_reqs:
+                yield "### Functional Requirements\n"
+                for fr in func_reqs:
+                    yield f"- {fr}\n"
+
+        if req["acceptance_criteria"]:
+            acc_criteria = self._safe_json_loads(req["acceptance_criteria"])
+            if acc_criteria:
+                yield "\n### Acceptance Criteria\n"
+                for ac in acc_criteria:
+                    yield f"- {ac}\n"
 
-            if req["acceptance_criteria"]:
-                acc_criteria = self._safe_json_loads(req["acceptance_criteria"])
-                if acc_criteria:
-                    report += "\n### Acceptance Criteria\n"
-                    for ac in acc_criteria:
-                        report += f"- {ac}\n"
+    def _get_requirement_details(self, **params) -> list[TextContent]:
+        """Get full requirement details"""
+        # Validate required parameters
+        error = self._validate_required_params(params, ["requirement_id"])
+        if error:
+            return self._create_error_response(error)
+
+        try:
+            details = self._render_requirement_details(params["requirement_id"])
+            if details is None:
+                return self._create_error_response("Requirement not found")
+
+            report, action_info = details
 
             # Get linked tasks
-            tasks = self.db.execute_query(
-                """
-                SELECT t.* FROM tasks t
-                JOIN requirement_tasks rt ON t.id = rt.task_id
-                WHERE rt.requirement_id = ?
-            """,
-                [params["requirement_id"]],
-                fetch_all=True,
-                row_factory=True,
-            )
+            tasks = self.db.execute_query(_LINKED_TASKS_SQL, [params["requirement_id"]], fetch_all=True)
 
             if tasks:
-                report += f"\n## Linked Tasks ({len(tasks)})\n"
-                for task in tasks:
-                    report += f"- {task['id']}: {task['title']} [{task['status']}]\n"
+                parts = [report, f"\n## Linked Tasks ({len(tasks)})\n"]
+                parts.extend(f"- {task['id']}: {task['title']} [{task['status']}]\n" for task in tasks)
+                report = "".join(parts)
 
             # Create above-the-fold response for requirement details
-            key_info = f"Requirement {req['id']} details"
-            action_info = f"📄 {req['title']} | {req['status']} | {req['priority']}"
+            key_info = f"Requirement {params['requirement_id']} details"
             return self._create_above_fold_response("INFO", key_info, action_info, report)
 
         except Exception as e:
@@ -735,66 +993,49 @@ Guidelines:
             return self._create_error_response(error)
 
         try:
-            # Get requirement
-            requirements = self.db.get_records("requirements", "*", "id = ?", [params["requirement_id"]])
+            # The requirement and everything linked to it come back from one query
+            rows = self.db.execute_query(_TRACE_SQL, {"requirement_id": params["requirement_id"]}, fetch_all=True)
+            linked: dict[str, list] = {
+                kind: [] for kind in ("requirement", "parent", "child", "child_total", "task", "architecture")
+            }
+            for row in rows:
+                linked[row["kind"]].append(row)
 
-            if not requirements:
+            if not linked["requirement"]:
                 return self._create_error_response("Requirement not found")
 
-            req = requirements[0]
-
-            # Get parent requirements (if this is a child requirement)
-            parent_requirements = self.db.execute_query(
-                """
-                SELECT r.* FROM requirements r
-                JOIN requirement_dependencies rd ON r.id = rd.depends_on_requirement_id
-                WHERE rd.requirement_id = ? AND rd.dependency_type = 'parent'
-            """,
-                [params["requirement_id"]],
-                fetch_all=True,
-                row_factory=True,
-            )
+            req = linked["requirement"][0]
+            parent_requirements = linked["parent"]
+            child_requirements = linked["child"]
+            tasks = linked["task"]
+            architecture = linked["architecture"]
 
-            # Get child requirements (if this is a parent requirement)
-            child_requirements = self.db.execute_query(
-                """
-                SELECT r.* FROM requirements r
-                JOIN requirement_dependencies rd ON r.id = rd.requirement_id
-                WHERE rd.depends_on_requirement_id = ? AND rd.dependency_type = 'parent'
-                ORDER BY r.created_at
-            """,
-                [params["requirement_id"]],
-                fetch_all=True,
-                row_factory=True,
-            )
+            report = "".join(self._iter_trace_report(linked))
 
-            # Get tasks
-            tasks = self.db.execute_query(
-                """
-                SELECT t.* FROM tasks t
-                JOIN requirement_tasks rt ON t.id = rt.task_id
-                WHERE rt.requirement_id = ?
-                ORDER BY t.task_number, t.subtask_number
-            """,
-                [params["requirement_id"]],
-                fetch_all=True,
-                row_factory=True,
-            )
+            # Create above-the-fold response for requirement trace
+            key_info = f"Requirement {req['id']} trace"
+            decomp_info = ""
+            if parent_requirements:
+                decomp_info = f" | Child of {len(parent_requirements)} parent(s)"
+            elif child_requirements:
+                decomp_info = f" | Parent to {len(child_requirements)} children"
 
-            # Get architecture
-            architecture = self.db.execute_query(
-                """
-                SELECT a.* FROM architecture a
-                JOIN requirement_architecture ra ON a.id = ra.architecture_id
-                WHERE ra.requirement_id = ?
-            """,
-                [params["requirement_id"]],
-                fetch_all=True,
-                row_factory=True,
-            )
+            arch_count = len(architecture) if architecture else 0
+            action_info = f"🔍 {req['title']} | {len(tasks)} tasks | {arch_count} architecture{decomp_info}"
+            return self._create_above_fold_response("INFO", key_info, action_info, report)
 
-            # Build trace report
-            report = f"""# Requirement Trace: {req["id"]}
+        except Exception as e:
+            return self._create_error_response("Failed to trace requirement", e)
+
+    def _iter_trace_report(self, linked: dict[str, list]):
+        """Yield the markdown sections of a requirement trace report, given the trace rows by kind"""
+        req = linked["requirement"][0]
+        parent_requirements = linked["parent"]
+        child_requirements = linked["child"]
+        tasks = linked["task"]
+        architecture = linked["architecture"]
+
+        yield f"""# Requirement Trace: {req["id"]}
 
 ## Requirement Details
 - **Title**: {req["title"]}
@@ -810,51 +1051,34 @@ Guidelines:
 {req["desired_state"]}
 """
 
-            # Add decomposition relationships if they exist
-            if parent_requirements:
-                report += f"\n## Parent Requirements ({len(parent_requirements)})\n"
-                for parent in parent_requirements:
-                    report += f"- {parent['id']}: {parent['title']} [{parent['status']}]\n"
-                    report += f"  Created: {parent['created_at']}\n"
-
-            if child_requirements:
-                report += f"\n## Child Requirements ({len(child_requirements)})\n"
-                for i, child in enumerate(child_requirements, 1):
-                    report += f"{i}. {child['id']}: {child['title']} [{child['status']}]\n"
-                    progress = f"{child['tasks_completed']}/{child['task_count']}"
-                    report += f"   Priority: {child['priority']} | Progress: {progress} tasks\n"
-
-                # Calculate overall decomposition progress
-                if child_requirements:
-                    total_child_tasks = sum(child["task_count"] for child in child_requirements)
-                    completed_child_tasks = sum(child["tasks_completed"] for child in child_requirements)
-                    decomp_progress = (completed_child_tasks / total_child_tasks * 100) if total_child_tasks > 0 else 0
-                    progress_text = f"{completed_child_tasks}/{total_child_tasks}"
-                    report += f"\n**Overall Decomposition Progress**: {progress_text} tasks ({decomp_progress:.1f}%)\n"
-
-            report += f"\n## Implementation Tasks ({len(tasks)})\n"
-            for task in tasks:
-                report += f"- {task['id']}: {task['title']} [{task['status']}]"
-                if task["assignee"]:
-                    report += f" (Assigned: {task['assignee']})"
-                report += "\n"
-
-            if architecture:
-                report += f"\n## Architecture Decisions ({len(architecture)})\n"
-                for arch in architecture:
-                    report += f"- {arch['id']}: {arch['title']} [{arch['status']}]\n"
-
-            # Create above-the-fold response for requirement trace
-            key_info = f"Requirement {req['id']} trace"
-            decomp_info = ""
-            if parent_requirements:
-                decomp_info = f" | Child of {len(parent_requirements)} parent(s)"
-            elif child_requirements:
-                decomp_info = f" | Parent to {len(child_requirements)} children"
-
-            arch_count = len(architecture) if architecture else 0
-            action_info = f"🔍 {req['title']} | {len(tasks)} tasks | {arch_count} architecture{decomp_info}"
-            return self._create_above_fold_response("INFO", key_info, action_info, report)
+        # Add decomposition relationships if they exist
+        if parent_requirements:
+            yield f"\n## Parent Requirements ({len(parent_requirements)})\n"
+            for _, parent_id, title, status, _, created_at, *_ in parent_requirements:
+                yield f"- {parent_id}: {title} [{status}]\n  Created: {created_at}\n"
+
+        if child_requirements:
+            yield f"\n## Child Requirements ({len(child_requirements)})\n"
+            for i, (_, child_id, title, status, priority, _, completed, count, *_) in enumerate(child_requirements, 1):
+                yield (
+                    f"{i}. {child_id}: {title} [{status}]\n"
+                    f"   Priority: {priority} | Progress: {completed}/{count} tasks\n"
+                )
 
-        except Exception as e:
-            return self._create_error_response("Failed to trace requirement", e)
+            # Calculate overall decomposition progress
+            child_total = linked["child_total"][0]
+            total_child_tasks = child_total["task_count"]
+            completed_child_tasks = child_total["tasks_completed"]
+            decomp_progress = (completed_child_tasks / total_child_tasks * 100) if total_child_tasks > 0 else 0
+            progress_text = f"{completed_child_tasks}/{total_child_tasks}"
+            yield f"\n**Overall Decomposition Progress**: {progress_text} tasks ({decomp_progress:.1f}%)\n"
+
+        yield f"\n## Implementation Tasks ({len(tasks)})\n"
+        for _, task_id, title, status, *_, assignee, _, _ in tasks:
+            assigned = f" (Assigned: {assignee})" if assignee else ""
+            yield f"- {task_id}: {title} [{status}]{assigned}\n"
+
+        if architecture:
+            yield f"\n## Architecture Decisions ({len(architecture)})\n"
+            for _, arch_id, title, status, *_ in architecture:
+                yield f"- {arch_id}: {title} [{status}]\n"
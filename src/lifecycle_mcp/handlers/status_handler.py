@@ -62,7 +62,6 @@ class StatusHandler(BaseHandler):
                 GROUP BY status
             """,
                 fetch_all=True,
-                row_factory=True,
             )
 
             # Get task stats
@@ -74,14 +73,13 @@ class StatusHandler(BaseHandler):
                 GROUP BY status
             """,
                 fetch_all=True,
-                row_factory=True,
             )
 
             # Get blocked items
             blocked = []
             if params.get("include_blocked", True):
                 try:
-                    blocked = self.db.execute_query("SELECT * FROM blocked_items", fetch_all=True, row_factory=True)
+                    blocked = self.db.execute_query("SELECT * FROM blocked_items", fetch_all=True)
                 except sqlite3.OperationalError:
                     # View might not work if no dependencies exist yet
                     blocked = []
@@ -150,7 +148,6 @@ class StatusHandler(BaseHandler):
                 GROUP BY status
             """,
                 fetch_all=True,
-                row_factory=True,
             )
 
             req_priority_stats = self.db.execute_query(
@@ -161,7 +158,6 @@ class StatusHandler(BaseHandler):
                 GROUP BY priority
             """,
                 fetch_all=True,
-                row_factory=True,
             )
 
             task_stats = self.db.execute_query(
@@ -172,7 +168,6 @@ class StatusHandler(BaseHandler):
                 GROUP BY status
             """,
                 fetch_all=True,
-                row_factory=True,
             )
 
             task_priority_stats = self.db.execute_query(
@@ -183,7 +178,6 @@ class StatusHandler(BaseHandler):
                 GROUP BY priority
             """,
                 fetch_all=True,
-                row_factory=True,
             )
 
             task_assignee_stats = self.db.execute_query(
@@ -194,7 +188,6 @@ class StatusHandler(BaseHandler):
                 GROUP BY assignee
             """,
                 fetch_all=True,
-                row_factory=True,
             )
 
             arch_stats = self.db.execute_query(
@@ -204,7 +197,6 @@ class StatusHandler(BaseHandler):
                 GROUP BY status
             """,
                 fetch_all=True,
-                row_factory=True,
             )
 
             # Convert to the format expected by the UI
@@ -368,7 +360,6 @@ class StatusHandler(BaseHandler):
                 GROUP BY status, priority
             """,
                 fetch_all=True,
-                row_factory=True,
             )
 
             for stat in req_stats:
@@ -389,7 +380,6 @@ class StatusHandler(BaseHandler):
                 GROUP BY status, priority
             """,
                 fetch_all=True,
-                row_factory=True,
             )
 
             for stat in task_stats:
@@ -406,7 +396,6 @@ class StatusHandler(BaseHandler):
                 GROUP BY status, type
             """,
                 fetch_all=True,
-                row_factory=True,
             )
 
             for stat in arch_stats:
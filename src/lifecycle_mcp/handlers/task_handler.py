@@ -141,13 +141,14 @@ class TaskHandler(BaseHandler):
         approved_statuses = {"Approved", "Architecture", "Ready", "Implemented", "Validated"}
         unapproved_reqs = []
 
-        for req_id in params["requirement_ids"]:
-            req_status = self.db.get_records("requirements", "status", "id = ?", [req_id])
-
-            if not req_status:
-                return self._create_error_response(f"Requirement {req_id} not found")
+        requirements = self.db.get_records_in("requirements", "id, status", "id", params["requirement_ids"])
+        missing = [req_id for req_id in params["requirement_ids"] if req_id not in requirements]
+        if missing:
+            label = "Requirement" if len(missing) == 1 else "Requirements"
+            return self._create_error_response(f"{label} {', '.join(missing)} not found")
 
-            status = req_status[0]["status"]
+        for req_id in params["requirement_ids"]:
+            status = requirements[req_id]["status"]
             if status not in approved_statuses:
                 unapproved_reqs.append(f"{req_id} (status: {status})")
 
@@ -160,65 +161,70 @@ class TaskHandler(BaseHandler):
             return self._create_error_response(error_msg)
 
         try:
-            # Get next task number
-            task_number = self.db.get_next_id("tasks", "task_number")
-
-            # Determine subtask number
-            subtask_number = 0
-            if params.get("parent_task_id"):
-                # For subtasks, find the parent's task number and get next subtask number
-                parent_info = self.db.get_records("tasks", "task_number", "id = ?", [params["parent_task_id"]])
-
-                if parent_info:
-                    parent_task_number = parent_info[0]["task_number"]
-                    # Count existing subtasks using relationships table
-                    existing_subtasks = self.db.get_records(
-                        "relationships", "COUNT(*) as count",
-                        "target_type = 'task' AND target_id = ? AND relationship_type = 'parent'",
-                        [params["parent_task_id"]]
-                    )
-                    subtask_number = existing_subtasks[0]["count"] + 1 if existing_subtasks else 1
-                    task_number = parent_task_number
-                else:
-                    # Parent task not found
-                    return self._create_error_response(f"Parent task {params['parent_task_id']} not found")
-
-            task_id = f"TASK-{task_number:04d}-{subtask_number:02d}-00"
-
-            # Prepare task data (removed parent_task_id column)
-            task_data = {
-                "id": task_id,
-                "task_number": task_number,
-                "subtask_number": subtask_number,
-                "version": 0,
-                "title": params["title"],
-                "priority": params["priority"],
-                "effort": params.get("effort"),
-                "user_story": params.get("user_story"),
-                "acceptance_criteria": self._safe_json_dumps(params.get("acceptance_criteria", [])),
-                "assignee": params.get("assignee"),
-                "status": "Not Started",
-            }
-
-            # Insert task
-            self.db.insert_record("tasks", task_data)
-
-            # Create parent-child relationship if this is a subtask
-            if params.get("parent_task_id"):
-                relationship_id = f"rel-{task_id}-{params['parent_task_id']}-parent"
-                relationship_data = {
-                    "id": relationship_id,
-                    "source_type": "task",
-                    "source_id": task_id,
-                    "target_type": "task",
-                    "target_id": params["parent_task_id"],
-                    "relationship_type": "parent"
+            # Number allocation and every insert share one write transaction so
+            # two concurrent creates cannot read the same MAX()
+            with self.db.transaction(writable=True):
+                # Get next task number
+                task_number = self.db.get_next_id("tasks", "task_number")
+
+                # Determine subtask number
+                subtask_number = 0
+                if params.get("parent_task_id"):
+                    # For subtasks, find the parent's task number and get next subtask number
+                    parent_info = self.db.get_records("tasks", "task_number", "id = ?", [params["parent_task_id"]])
+
+                    if parent_info:
+                        parent_task_number = parent_info[0]["task_number"]
+                        # Count existing subtasks using relationships table
+                        existing_subtasks = self.db.get_records(
+                            "relationships", "COUNT(*) as count",
+                            "target_type = 'task' AND target_id = ? AND relationship_type = 'parent'",
+                            [params["parent_task_id"]]
+                        )
+                        subtask_number = existing_subtasks[0]["count"] + 1 if existing_subtasks else 1
+                        task_number = parent_task_number
+                    else:
+                        # Parent task not found
+                        return self._create_error_response(f"Parent task {params['parent_task_id']} not found")
+
+                task_id = f"TASK-{task_number:04d}-{subtask_number:02d}-00"
+
+                # Prepare task data (removed parent_task_id column)
+                task_data = {
+                    "id": task_id,
+                    "task_number": task_number,
+                    "subtask_number": subtask_number,
+                    "version": 0,
+                    "title": params["title"],
+                    "priority": params["priority"],
+                    "effort": params.get("effort"),
+                    "user_story": params.get("user_story"),
+                    "acceptance_criteria": self._safe_json_dumps(params.get("acceptance_criteria", [])),
+                    "assignee": params.get("assignee"),
+                    "status": "Not Started",
                 }
-                self.db.insert_record("relationships", relationship_data)
 
-            # Link to requirements
-            for req_id in params["requirement_ids"]:
-                self.db.insert_record("requirement_tasks", {"requirement_id": req_id, "task_id": task_id})
+                # Insert task
+                self.db.insert_record("tasks", task_data)
+
+                # Create parent-child relationship if this is a subtask
+                if params.get("parent_task_id"):
+                    relationship_id = f"rel-{task_id}-{params['parent_task_id']}-parent"
+                    relationship_data = {
+                        "id": relationship_id,
+                        "source_type": "task",
+                        "source_id": task_id,
+                        "target_type": "task",
+                        "target_id": params["parent_task_id"],
+                        "relationship_type": "parent"
+                    }
+                    self.db.insert_record("relationships", relationship_data)
+
+                # Link to requirements
+                self.db.insert_many(
+                    "requirement_tasks",
+                    [{"requirement_id": req_id, "task_id": task_id} for req_id in params["requirement_ids"]],
+                )
 
             # Create GitHub issue if available
             github_url = None
@@ -302,12 +308,14 @@ class TaskHandler(BaseHandler):
             if params.get("assignee"):
                 update_data["assignee"] = params["assignee"]
 
-            # Update task
-            self.db.update_record("tasks", update_data, "id = ?", [params["task_id"]])
+            # Status change and comment are committed together
+            with self.db.transaction(writable=True):
+                # Update task
+                self.db.update_record("tasks", update_data, "id = ?", [params["task_id"]])
 
-            # Add comment if provided
-            if params.get("comment"):
-                self._add_review_comment("task", params["task_id"], params["comment"])
+                # Add comment if provided
+                if params.get("comment"):
+                    self._add_review_comment("task", params["task_id"], params["comment"])
 
             # Update GitHub issue if it exists using sync-safe operations
             github_updated = False
@@ -392,7 +400,6 @@ class TaskHandler(BaseHandler):
                 """,
                     [params["requirement_id"]],
                     fetch_all=True,
-                    row_factory=True,
                 )
             else:
                 # Build standard filters
@@ -460,7 +467,6 @@ class TaskHandler(BaseHandler):
                 """,
                     [params["requirement_id"]],
                     fetch_all=True,
-                    row_factory=True,
                 )
             else:
                 # Build standard filters
@@ -482,9 +488,7 @@ class TaskHandler(BaseHandler):
 
             # Convert to list of dictionaries with JSON parsing
             tasks_list = []
-            for task in tasks:
-                task_dict = dict(task) if hasattr(task, 'keys') else task
-
+            for task_dict in self._rows_to_dicts(tasks):
                 # Parse JSON fields if they exist as strings
                 json_fields = ['acceptance_criteria']
                 for field in json_fields:
@@ -745,7 +749,6 @@ class TaskHandler(BaseHandler):
             """,
                 [params["task_id"]],
                 fetch_all=True,
-                row_factory=True,
             )
 
             if requirements:
@@ -764,10 +767,8 @@ class TaskHandler(BaseHandler):
             subtasks = []
             if child_relationship_records:
                 child_task_ids = [r["source_id"] for r in child_relationship_records]
-                for task_id in child_task_ids:
-                    task_records = self.db.get_records("tasks", "id, title, status", "id = ?", [task_id])
-                    if task_records:
-                        subtasks.extend(task_records)
+                child_tasks = self.db.get_records_in("tasks", "id, title, status", "id", child_task_ids)
+                subtasks = [child_tasks[task_id] for task_id in child_task_ids if task_id in child_tasks]
 
             if subtasks:
                 task_info += f"\n## Subtasks ({len(subtasks)})\n"
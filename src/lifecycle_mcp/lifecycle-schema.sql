@@ -122,7 +122,7 @@ CREATE TABLE IF NOT EXISTS requirement_tasks (
     task_id TEXT NOT NULL REFERENCES tasks(id),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     PRIMARY KEY (requirement_id, task_id)
-);
+) WITHOUT ROWID; -- rows are only ever looked up by the composite key
 
 CREATE TABLE IF NOT EXISTS requirement_architecture (
     requirement_id TEXT NOT NULL REFERENCES requirements(id),
@@ -180,6 +180,13 @@ CREATE TABLE IF NOT EXISTS lifecycle_events (
     occurred_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- LLM decomposition analyses, keyed by a hash of the normalized requirement text
+CREATE TABLE IF NOT EXISTS requirement_analysis_cache (
+    key TEXT PRIMARY KEY,
+    response_json TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Views for common queries
 CREATE VIEW IF NOT EXISTS requirement_progress AS
 SELECT 
@@ -260,6 +267,9 @@ CREATE INDEX IF NOT EXISTS idx_requirements_status ON requirements(status);
 CREATE INDEX IF NOT EXISTS idx_requirements_priority ON requirements(priority);
 CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
 CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks(assignee);
+CREATE INDEX IF NOT EXISTS idx_requirements_type_number ON requirements(type, requirement_number);
+CREATE INDEX IF NOT EXISTS idx_tasks_task_number ON tasks(task_number, subtask_number);
+CREATE INDEX IF NOT EXISTS idx_reqdep_depends_type ON requirement_dependencies(depends_on_requirement_id, dependency_type);
 CREATE INDEX IF NOT EXISTS idx_lifecycle_events_entity ON lifecycle_events(entity_type, entity_id);
 CREATE INDEX IF NOT EXISTS idx_approvals_entity ON approvals(entity_type, entity_id);
 
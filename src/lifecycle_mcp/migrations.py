@@ -4,8 +4,11 @@ Database migration utilities for MCP Lifecycle Management Server
 Handles schema updates and data migrations
 """
 
+import logging
 import sqlite3
 
+logger = logging.getLogger(__name__)
+
 
 def apply_github_integration_migration(db_path: str) -> bool:
     """
@@ -33,14 +36,14 @@ def apply_github_integration_migration(db_path: str) -> bool:
             cursor.execute("ALTER TABLE tasks ADD COLUMN github_issue_url TEXT")
 
             conn.commit()
-            print("GitHub integration migration applied successfully")
+            logger.info("GitHub integration migration applied successfully")
             return True
         else:
-            print("GitHub integration migration already applied")
+            logger.info("GitHub integration migration already applied")
             return True
 
     except Exception as e:
-        print(f"Error applying GitHub integration migration: {e}")
+        logger.error("Error applying GitHub integration migration: %s", e)
         return False
     finally:
         if "conn" in locals():
@@ -77,7 +80,7 @@ def get_schema_version(db_path: str) -> int:
             return 0
 
     except Exception as e:
-        print(f"Error getting schema version: {e}")
+        logger.error("Error getting schema version: %s", e)
         return 0
     finally:
         if "conn" in locals():
@@ -102,7 +105,7 @@ def set_schema_version(db_path: str, version: int, description: str) -> bool:
         return True
 
     except Exception as e:
-        print(f"Error setting schema version: {e}")
+        logger.error("Error setting schema version: %s", e)
         return False
     finally:
         if "conn" in locals():
@@ -135,14 +138,14 @@ def apply_github_sync_metadata_migration(db_path: str) -> bool:
             cursor.execute("ALTER TABLE tasks ADD COLUMN github_last_sync TEXT")
 
             conn.commit()
-            print("GitHub sync metadata migration applied successfully")
+            logger.info("GitHub sync metadata migration applied successfully")
             return True
         else:
-            print("GitHub sync metadata migration already applied")
+            logger.info("GitHub sync metadata migration already applied")
             return True
 
     except Exception as e:
-        print(f"Error applying GitHub sync metadata migration: {e}")
+        logger.error("Error applying GitHub sync metadata migration: %s", e)
         return False
     finally:
         if "conn" in locals():
@@ -337,14 +340,14 @@ def apply_decomposition_extension_migration(db_path: str) -> bool:
             """)
 
             conn.commit()
-            print("Decomposition extension migration applied successfully")
+            logger.info("Decomposition extension migration applied successfully")
             return True
         else:
-            print("Decomposition extension migration already applied")
+            logger.info("Decomposition extension migration already applied")
             return True
 
     except Exception as e:
-        print(f"Error applying decomposition extension migration: {e}")
+        logger.error("Error applying decomposition extension migration: %s", e)
         return False
     finally:
         if "conn" in locals():
@@ -397,11 +400,11 @@ def fix_blocked_items_view_migration(db_path: str) -> bool:
         """)
 
         conn.commit()
-        print("Blocked items view migration applied successfully")
+        logger.info("Blocked items view migration applied successfully")
         return True
 
     except Exception as e:
-        print(f"Error applying blocked items view migration: {e}")
+        logger.error("Error applying blocked items view migration: %s", e)
         return False
     finally:
         if "conn" in locals():
@@ -446,7 +449,7 @@ def apply_relationship_schema_migration(db_path: str) -> bool:
             cursor.execute("CREATE INDEX idx_relationships_type ON relationships(relationship_type)")
 
             conn.commit()
-            print("Relationship schema migration applied successfully")
+            logger.info("Relationship schema migration applied successfully")
 
             # Validate table creation
             cursor.execute("PRAGMA table_info(relationships)")
@@ -460,11 +463,11 @@ def apply_relationship_schema_migration(db_path: str) -> bool:
 
             return True
         else:
-            print("Relationship schema migration already applied")
+            logger.info("Relationship schema migration already applied")
             return True
 
     except Exception as e:
-        print(f"Error applying relationship schema migration: {e}")
+        logger.error("Error applying relationship schema migration: %s", e)
         if "conn" in locals():
             conn.rollback()
         return False
@@ -492,10 +495,10 @@ def apply_relationship_consolidation_migration(db_path: str) -> bool:
         existing_relationships = cursor.fetchone()[0]
 
         if existing_relationships > 0:
-            print("Relationship consolidation migration already applied")
+            logger.info("Relationship consolidation migration already applied")
             return True
 
-        print("Starting relationship data consolidation...")
+        logger.info("Starting relationship data consolidation...")
 
         # 1. Migrate parent_task_id relationships from tasks table
         cursor.execute("""
@@ -511,7 +514,7 @@ def apply_relationship_consolidation_migration(db_path: str) -> bool:
                 INSERT INTO relationships (id, source_type, source_id, target_type, target_id, relationship_type)
                 VALUES (?, 'task', ?, 'task', ?, 'parent')
             """, (relationship_id, task_id, parent_task_id))
-            print(f"Migrated parent relationship: {task_id} → {parent_task_id}")
+            logger.debug("Migrated parent relationship: %s → %s", task_id, parent_task_id)
 
         # 2. Migrate requirement_tasks junction table data
         cursor.execute("""
@@ -526,7 +529,7 @@ def apply_relationship_consolidation_migration(db_path: str) -> bool:
                 INSERT INTO relationships (id, source_type, source_id, target_type, target_id, relationship_type, created_at)
                 VALUES (?, 'requirement', ?, 'task', ?, 'implements', ?)
             """, (relationship_id, req_id, task_id, created_at))
-            print(f"Migrated requirement→task relationship: {req_id} → {task_id}")
+            logger.debug("Migrated requirement→task relationship: %s → %s", req_id, task_id)
 
         # 3. Migrate requirement_architecture junction table data (if any)
         cursor.execute("""
@@ -544,7 +547,7 @@ def apply_relationship_consolidation_migration(db_path: str) -> bool:
                 INSERT INTO relationships (id, source_type, source_id, target_type, target_id, relationship_type)
                 VALUES (?, 'requirement', ?, 'architecture', ?, ?)
             """, (relationship_id, req_id, arch_id, rel_type))
-            print(f"Migrated requirement→architecture relationship: {req_id} → {arch_id} ({rel_type})")
+            logger.debug("Migrated requirement→architecture relationship: %s → %s (%s)", req_id, arch_id, rel_type)
 
         # 4. Migrate task_dependencies table data (if any)
         cursor.execute("""
@@ -562,7 +565,7 @@ def apply_relationship_consolidation_migration(db_path: str) -> bool:
                 INSERT INTO relationships (id, source_type, source_id, target_type, target_id, relationship_type)
                 VALUES (?, 'task', ?, 'task', ?, ?)
             """, (relationship_id, task_id, depends_on_task_id, dep_type))
-            print(f"Migrated task dependency: {task_id} → {depends_on_task_id} ({dep_type})")
+            logger.debug("Migrated task dependency: %s → %s (%s)", task_id, depends_on_task_id, dep_type)
 
         # 5. Migrate requirement_dependencies table data (if any)
         cursor.execute("""
@@ -580,7 +583,7 @@ def apply_relationship_consolidation_migration(db_path: str) -> bool:
                 INSERT INTO relationships (id, source_type, source_id, target_type, target_id, relationship_type)
                 VALUES (?, 'requirement', ?, 'requirement', ?, ?)
             """, (relationship_id, req_id, depends_on_req_id, dep_type))
-            print(f"Migrated requirement dependency: {req_id} → {depends_on_req_id} ({dep_type})")
+            logger.debug("Migrated requirement dependency: %s → %s (%s)", req_id, depends_on_req_id, dep_type)
 
         conn.commit()
 
@@ -593,11 +596,13 @@ def apply_relationship_consolidation_migration(db_path: str) -> bool:
         if final_count != total_migrated:
             raise Exception(f"Migration verification failed: expected {total_migrated} relationships, found {final_count}")
 
-        print(f"Relationship consolidation migration completed successfully: {final_count} relationships migrated")
+        logger.info(
+            "Relationship consolidation migration completed successfully: %s relationships migrated", final_count
+        )
         return True
 
     except Exception as e:
-        print(f"Error applying relationship consolidation migration: {e}")
+        logger.error("Error applying relationship consolidation migration: %s", e)
         if "conn" in locals():
             conn.rollback()
         return False
@@ -615,7 +620,7 @@ def apply_relationship_cleanup_migration(db_path: str) -> bool:
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
 
-        print("Starting relationship table cleanup migration...")
+        logger.info("Starting relationship table cleanup migration...")
 
         # Check if cleanup already applied by checking if any tables exist
         cursor.execute("""
@@ -630,21 +635,32 @@ def apply_relationship_cleanup_migration(db_path: str) -> bool:
         has_parent_task_id_check = any(col[1] == 'parent_task_id' for col in columns_info_check)
 
         if not existing_tables and not has_parent_task_id_check:
-            print("Relationship cleanup migration already applied")
+            logger.info("Relationship cleanup migration already applied")
             return True
 
-        print(f"Found {len(existing_tables)} tables to clean up: {existing_tables}")
+        logger.info("Found %s tables to clean up: %s", len(existing_tables), existing_tables)
         if has_parent_task_id_check:
-            print("parent_task_id column needs to be removed")
+            logger.info("parent_task_id column needs to be removed")
 
         # Verify data has been migrated to relationships table
         cursor.execute("SELECT COUNT(*) FROM relationships")
         relationship_count = cursor.fetchone()[0]
 
         if relationship_count == 0:
+            # With no link data anywhere there is nothing to clean up; failing
+            # here would block every later migration on empty databases
+            legacy_rows = sum(
+                cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in existing_tables
+            )
+            if has_parent_task_id_check:
+                cursor.execute("SELECT COUNT(*) FROM tasks WHERE parent_task_id IS NOT NULL")
+                legacy_rows += cursor.fetchone()[0]
+            if legacy_rows == 0:
+                logger.info("No relationship data to consolidate, nothing to clean up")
+                return True
             raise Exception("Cannot cleanup: no relationships found in unified table. Data consolidation may not have completed.")
 
-        print(f"Found {relationship_count} relationships in unified table, proceeding with cleanup...")
+        logger.info("Found %s relationships in unified table, proceeding with cleanup...", relationship_count)
 
         # 1. Drop task_dependencies table (verify data migrated to unified table)
         if 'task_dependencies' in existing_tables:
@@ -669,10 +685,10 @@ def apply_relationship_cleanup_migration(db_path: str) -> bool:
                 if unmigrated_count > 0:
                     raise Exception(f"Cannot drop task_dependencies: {unmigrated_count} relationships not found in unified table. Data consolidation incomplete.")
 
-                print(f"Verified {old_count} task dependencies migrated to unified table")
+                logger.info("Verified %s task dependencies migrated to unified table", old_count)
 
             cursor.execute("DROP TABLE task_dependencies")
-            print("Dropped task_dependencies table")
+            logger.info("Dropped task_dependencies table")
 
         # 2. Drop requirement_dependencies table (verify data migrated to unified table)
         if 'requirement_dependencies' in existing_tables:
@@ -697,10 +713,10 @@ def apply_relationship_cleanup_migration(db_path: str) -> bool:
                 if unmigrated_count > 0:
                     raise Exception(f"Cannot drop requirement_dependencies: {unmigrated_count} relationships not found in unified table. Data consolidation incomplete.")
 
-                print(f"Verified {old_count} requirement dependencies migrated to unified table")
+                logger.info("Verified %s requirement dependencies migrated to unified table", old_count)
 
             cursor.execute("DROP TABLE requirement_dependencies")
-            print("Dropped requirement_dependencies table")
+            logger.info("Dropped requirement_dependencies table")
 
         # 3. Drop requirement_architecture table (verify data migrated to unified table)
         if 'requirement_architecture' in existing_tables:
@@ -725,10 +741,10 @@ def apply_relationship_cleanup_migration(db_path: str) -> bool:
                 if unmigrated_count > 0:
                     raise Exception(f"Cannot drop requirement_architecture: {unmigrated_count} relationships not found in unified table. Data consolidation incomplete.")
 
-                print(f"Verified {old_count} requirement->architecture relationships migrated to unified table")
+                logger.info("Verified %s requirement->architecture relationships migrated to unified table", old_count)
 
             cursor.execute("DROP TABLE requirement_architecture")
-            print("Dropped requirement_architecture table")
+            logger.info("Dropped requirement_architecture table")
 
         # 4. Remove parent_task_id column from tasks table
         # SQLite doesn't support DROP COLUMN, so we need to recreate the table
@@ -762,7 +778,7 @@ def apply_relationship_cleanup_migration(db_path: str) -> bool:
                 if unmigrated_count > 0:
                     raise Exception(f"Cannot remove parent_task_id: {unmigrated_count} parent relationships not found in unified table. Data consolidation incomplete.")
 
-                print(f"Verified {parent_count} parent task relationships migrated to unified table")
+                logger.info("Verified %s parent task relationships migrated to unified table", parent_count)
 
             # Get all columns except parent_task_id
             columns_to_keep = [col[1] for col in columns_info if col[1] != 'parent_task_id']
@@ -810,7 +826,7 @@ def apply_relationship_cleanup_migration(db_path: str) -> bool:
                 END
             """)
 
-            print("Removed parent_task_id column from tasks table")
+            logger.info("Removed parent_task_id column from tasks table")
 
         # 5. Update requirement task completion trigger to use new relationships table
         cursor.execute("DROP TRIGGER IF EXISTS update_requirement_task_completion")
@@ -839,7 +855,7 @@ def apply_relationship_cleanup_migration(db_path: str) -> bool:
                 );
             END
         """)
-        print("Updated requirement task completion trigger for unified relationships table")
+        logger.info("Updated requirement task completion trigger for unified relationships table")
 
         # 6. Update requirement task count trigger to use new relationships table
         cursor.execute("DROP TRIGGER IF EXISTS update_requirement_task_count_insert")
@@ -859,7 +875,7 @@ def apply_relationship_cleanup_migration(db_path: str) -> bool:
                 WHERE id = NEW.source_id;
             END
         """)
-        print("Updated requirement task count trigger for unified relationships table")
+        logger.info("Updated requirement task count trigger for unified relationships table")
 
         # 7. Update requirement_progress view to use new relationships table
         cursor.execute("DROP VIEW IF EXISTS requirement_progress")
@@ -884,7 +900,7 @@ def apply_relationship_cleanup_migration(db_path: str) -> bool:
             WHERE r.status != 'Deprecated'
             GROUP BY r.id
         """)
-        print("Updated requirement_progress view for unified relationships table")
+        logger.info("Updated requirement_progress view for unified relationships table")
 
         # 8. Update requirement_hierarchy view to use new relationships table
         cursor.execute("DROP VIEW IF EXISTS requirement_hierarchy")
@@ -939,7 +955,7 @@ def apply_relationship_cleanup_migration(db_path: str) -> bool:
             )
             SELECT * FROM requirement_tree
         """)
-        print("Updated requirement_hierarchy view for unified relationships table")
+        logger.info("Updated requirement_hierarchy view for unified relationships table")
 
         # 9. Update blocked_items view to use new relationships table
         cursor.execute("DROP VIEW IF EXISTS blocked_items")
@@ -977,7 +993,7 @@ def apply_relationship_cleanup_migration(db_path: str) -> bool:
             AND dr.status NOT IN ('Validated', 'Deprecated')
             GROUP BY r.id
         """)
-        print("Updated blocked_items view for unified relationships table")
+        logger.info("Updated blocked_items view for unified relationships table")
 
         conn.commit()
 
@@ -997,11 +1013,11 @@ def apply_relationship_cleanup_migration(db_path: str) -> bool:
         if any(col[1] == 'parent_task_id' for col in columns_after):
             raise Exception("Cleanup verification failed: parent_task_id column still exists in tasks table")
 
-        print(f"Relationship cleanup migration completed successfully")
+        logger.info("Relationship cleanup migration completed successfully")
         return True
 
     except Exception as e:
-        print(f"Error applying relationship cleanup migration: {e}")
+        logger.error("Error applying relationship cleanup migration: %s", e)
         if "conn" in locals():
             conn.rollback()
         return False
@@ -1010,28 +1026,178 @@ def apply_relationship_cleanup_migration(db_path: str) -> bool:
             conn.close()
 
 
+def apply_id_allocation_index_migration(db_path: str) -> bool:
+    """
+    Add indexes backing sequential ID allocation
+
+    get_next_id computes MAX(number) per table (and per requirement type);
+    with a leading index on those columns SQLite answers it with a single
+    index seek instead of scanning the table.
+
+    Args:
+        db_path: Path to the SQLite database
+
+    Returns:
+        True if migration was applied successfully, False otherwise
+    """
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_requirements_type_number ON requirements(type, requirement_number)"
+        )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_task_number ON tasks(task_number, subtask_number)")
+
+        conn.commit()
+        logger.info("ID allocation index migration applied successfully")
+        return True
+
+    except Exception as e:
+        logger.error("Error applying ID allocation index migration: %s", e)
+        return False
+    finally:
+        if "conn" in locals():
+            conn.close()
+
+
+def apply_analysis_cache_migration(db_path: str) -> bool:
+    """
+    Add a table persisting LLM requirement analyses
+
+    Resubmitted requirements are answered from this table instead of a new
+    sampling round trip, including after a server restart.
+
+    Args:
+        db_path: Path to the SQLite database
+
+    Returns:
+        True if migration was applied successfully, False otherwise
+    """
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS requirement_analysis_cache (
+                key TEXT PRIMARY KEY,
+                response_json TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        conn.commit()
+        logger.info("Analysis cache migration applied successfully")
+        return True
+
+    except Exception as e:
+        logger.error("Error applying analysis cache migration: %s", e)
+        return False
+    finally:
+        if "conn" in locals():
+            conn.close()
+
+
+def apply_dependency_lookup_index_migration(db_path: str) -> bool:
+    """
+    Index requirement_dependencies by the requirement depended on
+
+    The primary key leads with requirement_id, which serves parent lookups;
+    finding a requirement's children filters on depends_on_requirement_id
+    and scanned the table without this index. Databases that already
+    dropped the table in the relationship cleanup are left unchanged.
+
+    Args:
+        db_path: Path to the SQLite database
+
+    Returns:
+        True if migration was applied successfully, False otherwise
+    """
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'requirement_dependencies'")
+        if cursor.fetchone():
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_reqdep_depends_type "
+                "ON requirement_dependencies(depends_on_requirement_id, dependency_type)"
+            )
+            cursor.execute("ANALYZE requirement_dependencies")
+
+        conn.commit()
+        logger.info("Dependency lookup index migration applied successfully")
+        return True
+
+    except Exception as e:
+        logger.error("Error applying dependency lookup index migration: %s", e)
+        return False
+    finally:
+        if "conn" in locals():
+            conn.close()
+
+
+# Ordered (version, description, migration) entries applied by apply_all_migrations
+MIGRATIONS = [
+    (1, "GitHub integration fields", apply_github_integration_migration),
+    (2, "GitHub sync metadata fields", apply_github_sync_metadata_migration),
+    (3, "Requirement decomposition extension", apply_decomposition_extension_migration),
+    (4, "Fix blocked_items view column reference", fix_blocked_items_view_migration),
+    (5, "Create unified relationships table", apply_relationship_schema_migration),
+    (6, "Consolidate relationship data", apply_relationship_consolidation_migration),
+    (7, "Remove redundant relationship tables", apply_relationship_cleanup_migration),
+    (8, "Indexes for sequential ID allocation", apply_id_allocation_index_migration),
+    (9, "Persistent LLM analysis cache", apply_analysis_cache_migration),
+    (10, "Index requirement dependencies by target", apply_dependency_lookup_index_migration),
+]
+
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# Idempotent CREATE ... IF NOT EXISTS migrations that do not depend on the
+# ones before them. They still run when an earlier migration fails, so a
+# stuck relationship cleanup does not hold them back; the schema version
+# is not advanced past the failure, and they run again on the next pass.
+INDEPENDENT_MIGRATIONS = frozenset({8, 9, 10})
+
+
+def set_user_version(db_path: str, version: int) -> bool:
+    """Mirror the schema version into PRAGMA user_version for a cheap up-to-date check"""
+    try:
+        conn = sqlite3.connect(db_path)
+        conn.execute(f"PRAGMA user_version = {int(version)}")
+        return True
+
+    except Exception as e:
+        logger.error("Error setting user_version: %s", e)
+        return False
+    finally:
+        if "conn" in locals():
+            conn.close()
+
+
 def apply_all_migrations(db_path: str) -> bool:
     """Apply all pending migrations to the database"""
     current_version = get_schema_version(db_path)
+    failed = False
 
-    migrations = [
-        (1, "GitHub integration fields", apply_github_integration_migration),
-        (2, "GitHub sync metadata fields", apply_github_sync_metadata_migration),
-        (3, "Requirement decomposition extension", apply_decomposition_extension_migration),
-        (4, "Fix blocked_items view column reference", fix_blocked_items_view_migration),
-        (5, "Create unified relationships table", apply_relationship_schema_migration),
-        (6, "Consolidate relationship data", apply_relationship_consolidation_migration),
-        (7, "Remove redundant relationship tables", apply_relationship_cleanup_migration),
-    ]
-
-    for version, description, migration_func in migrations:
-        if current_version < version:
-            print(f"Applying migration {version}: {description}")
+    try:
+        for version, description, migration_func in MIGRATIONS:
+            if current_version >= version:
+                continue
+            if failed:
+                if version in INDEPENDENT_MIGRATIONS:
+                    logger.info("Applying independent migration %s: %s", version, description)
+                    migration_func(db_path)
+                continue
+
+            logger.info("Applying migration %s: %s", version, description)
             if migration_func(db_path):
                 set_schema_version(db_path, version, description)
                 current_version = version
             else:
-                print(f"Migration {version} failed")
-                return False
+                logger.error("Migration %s failed", version)
+                failed = True
 
-    return True
+        return not failed
+    finally:
+        set_user_version(db_path, current_version)
@@ -89,6 +89,9 @@ class LifecycleMCPServer:
             "get_project_metrics": self.status_handler,
         }
 
+        # Tool objects built on the first list_tools call; definitions are static
+        self._tools: list[Tool] | None = None
+
         # Create MCP server instance
         self.server = Server("lifecycle-management")
         self._register_handlers()
@@ -105,6 +108,9 @@ class LifecycleMCPServer:
         @self.server.list_tools()
         async def list_tools() -> list[Tool]:
             """List available tools from all handlers"""
+            if self._tools is not None:
+                return self._tools
+
             tools = []
 
             # Collect tool definitions from all handlers
@@ -129,6 +135,7 @@ class LifecycleMCPServer:
                     )
 
             logger.info(f"Registered {len(tools)} MCP tools")
+            self._tools = tools
             return tools
 
         @self.server.call_tool()
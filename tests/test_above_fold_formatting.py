@@ -2,6 +2,8 @@
 Unit tests for above-the-fold display optimization
 """
 
+import logging
+
 import pytest
 
 from lifecycle_mcp.handlers.base_handler import BaseHandler
@@ -96,6 +98,19 @@ class TestAboveFoldFormatting:
         text = result[0].text
         assert text.startswith("[ERROR] Test error message")
 
+    def test_error_response_logs_traceback_only_at_debug(self, handler, caplog):
+        """Test that exception tracebacks are only attached to the log record at DEBUG level"""
+        error = ValueError("bad input")
+
+        with caplog.at_level(logging.INFO, logger=handler.logger.name):
+            handler._create_error_response("Failed", error)
+        assert caplog.records[-1].getMessage() == "Failed: bad input"
+        assert caplog.records[-1].exc_info is None
+
+        with caplog.at_level(logging.DEBUG, logger=handler.logger.name):
+            handler._create_error_response("Failed", error)
+        assert caplog.records[-1].exc_info[1] is error
+
     def test_above_fold_response_handles_empty_strings(self, handler):
         """Test that above-the-fold response handles empty strings gracefully"""
         result = handler._create_above_fold_response("INFO", "Key info", "", "")
@@ -2,6 +2,9 @@
 Unit tests for ArchitectureHandler
 """
 
+import asyncio
+import threading
+
 import pytest
 
 
@@ -47,6 +50,29 @@ class TestArchitectureHandler:
         assert records[0]["context"] == "This is the context for the test decision"
         assert records[0]["decision_outcome"] == "This is the test decision"
 
+    def test_concurrent_creates_get_distinct_adr_numbers(
+        self, architecture_handler, requirement_handler, sample_requirement_data, sample_architecture_data
+    ):
+        """Test ADRs created from several threads never share a number"""
+        requirement_handler._create_single_requirement(sample_requirement_data)
+        errors = []
+
+        def create():
+            try:
+                asyncio.run(architecture_handler._create_architecture_decision(**sample_architecture_data))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=create) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        records = architecture_handler.db.get_records("architecture", "id", order_by="id")
+        assert [record["id"] for record in records] == [f"ADR-{number:04d}" for number in range(1, 7)]
+
     @pytest.mark.asyncio
     async def test_create_architecture_decision_missing_params(self, architecture_handler):
         """Test architecture decision creation with missing required parameters"""
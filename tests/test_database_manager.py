@@ -2,14 +2,42 @@
 Unit tests for DatabaseManager
 """
 
+import gc
+import logging
 import os
 import sqlite3
 import tempfile
+import threading
 from pathlib import Path
 
 import pytest
 
-from lifecycle_mcp.database_manager import DatabaseManager
+from lifecycle_mcp.database_manager import DatabaseManager, _build_delete_sql, _build_insert_sql, _load_schema_sql
+from lifecycle_mcp.migrations import (
+    LATEST_SCHEMA_VERSION,
+    MIGRATIONS,
+    apply_all_migrations,
+    get_schema_version,
+    set_schema_version,
+)
+
+
+def _make_version_6_database(db_path: str) -> None:
+    """Build a database as the releases before migration 7 left it"""
+    schema_sql = (Path(__file__).parent.parent / "src" / "lifecycle_mcp" / "lifecycle-schema.sql").read_text()
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(schema_sql)
+        # Objects added to the schema file together with migrations 8 and later
+        conn.executescript(
+            "DROP INDEX idx_requirements_type_number; DROP INDEX idx_tasks_task_number; "
+            "DROP INDEX idx_reqdep_depends_type; DROP TABLE requirement_analysis_cache;"
+        )
+    get_schema_version(db_path)  # creates the schema_version table
+    for version, description, migration_func in MIGRATIONS[:6]:
+        assert migration_func(db_path)
+        assert set_schema_version(db_path, version, description)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("PRAGMA user_version = 6")
 
 
 @pytest.mark.unit
@@ -31,6 +59,126 @@ class TestDatabaseManager:
         # Clean up
         os.unlink(db_path)
 
+    def test_new_databases_share_one_schema_read(self, tmp_path):
+        """Test that the schema script is read once and every table lands in a new database"""
+        _load_schema_sql.cache_clear()
+
+        for name in ("first.db", "second.db"):
+            db = DatabaseManager(str(tmp_path / name))
+            assert db.check_exists("sqlite_master", "type = 'table' AND name = ?", ["requirement_analysis_cache"])
+            db.close()
+
+        assert _load_schema_sql.cache_info().misses == 1
+
+    def test_new_database_is_stamped_current(self, tmp_path, mocker):
+        """Test that a database created here skips the migration pass on every later start"""
+        db_path = str(tmp_path / "fresh.db")
+        DatabaseManager(db_path).close()
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == LATEST_SCHEMA_VERSION
+            assert conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] == LATEST_SCHEMA_VERSION
+
+        apply = mocker.patch("lifecycle_mcp.database_manager.apply_all_migrations")
+        db = DatabaseManager(db_path)
+        db.execute_query("SELECT 1", fetch_one=True)
+        apply.assert_not_called()
+        db.close()
+
+    def test_version_6_database_upgrades_past_relationship_cleanup(self, tmp_path):
+        """Test an empty pre-cleanup database completes every migration instead of stopping at 7"""
+        db_path = str(tmp_path / "v6.db")
+        _make_version_6_database(db_path)
+
+        assert apply_all_migrations(db_path)
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == LATEST_SCHEMA_VERSION
+            # Nothing was consolidated, so the link tables the handlers use are kept
+            assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'requirement_architecture'").fetchone()
+
+    def test_analysis_cache_created_when_cleanup_fails(self, tmp_path):
+        """Test the analysis cache table reaches a version 6 database whose relationship cleanup fails"""
+        db_path = str(tmp_path / "v6.db")
+        _make_version_6_database(db_path)
+        # Legacy link rows that were never consolidated make migration 7 fail
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "INSERT INTO requirement_architecture (requirement_id, architecture_id) VALUES ('REQ-X', 'ADR-X')"
+            )
+
+        assert not apply_all_migrations(db_path)
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == 6
+            assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'requirement_analysis_cache'").fetchone()
+
+    @pytest.mark.parametrize("cleanup_fails", [False, True])
+    def test_id_allocation_indexes_reach_upgraded_database(self, tmp_path, cleanup_fails):
+        """Test a version 6 database gets the get_next_id indexes whether or not migration 7 succeeds"""
+        db_path = str(tmp_path / "v6.db")
+        _make_version_6_database(db_path)
+        if cleanup_fails:
+            with sqlite3.connect(db_path) as conn:
+                conn.execute("INSERT INTO task_dependencies (task_id, depends_on_task_id) VALUES ('T-1', 'T-2')")
+
+        apply_all_migrations(db_path)
+
+        with sqlite3.connect(db_path) as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT COALESCE(MAX(requirement_number), 0) + 1 FROM requirements WHERE type = ?",
+                ["FUNC"],
+            ).fetchall()
+            assert any("idx_requirements_type_number" in row[3] for row in plan)
+            assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_tasks_task_number'").fetchone()
+
+    @pytest.mark.parametrize("cleanup_fails", [False, True])
+    def test_dependency_lookup_index_reaches_upgraded_database(self, tmp_path, cleanup_fails):
+        """Test a version 6 database gets idx_reqdep_depends_type whether or not migration 7 succeeds"""
+        db_path = str(tmp_path / "v6.db")
+        _make_version_6_database(db_path)
+        if cleanup_fails:
+            with sqlite3.connect(db_path) as conn:
+                conn.execute("INSERT INTO task_dependencies (task_id, depends_on_task_id) VALUES ('T-1', 'T-2')")
+
+        apply_all_migrations(db_path)
+
+        with sqlite3.connect(db_path) as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT requirement_id FROM requirement_dependencies "
+                "WHERE depends_on_requirement_id = ? AND dependency_type = 'parent'",
+                ["REQ-0001-FUNC-00"],
+            ).fetchall()
+            assert any("idx_reqdep_depends_type" in row[3] for row in plan)
+
+    def test_migrations_run_on_first_borrow(self, temp_db, mocker):
+        """Test that migrations are deferred to the first query and skipped once up to date"""
+        apply = mocker.patch("lifecycle_mcp.database_manager.apply_all_migrations")
+        db = DatabaseManager(temp_db)
+        apply.assert_not_called()
+
+        db.execute_query("SELECT 1", fetch_one=True)
+        db.execute_query("SELECT 1", fetch_one=True)
+        apply.assert_called_once_with(temp_db)
+        db.close()
+
+        # Once user_version records the latest schema, no migration pass is needed
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute(f"PRAGMA user_version = {LATEST_SCHEMA_VERSION}")
+        apply.reset_mock()
+        db = DatabaseManager(temp_db)
+        db.execute_query("SELECT 1", fetch_one=True)
+        apply.assert_not_called()
+        db.close()
+
+    def test_migrations_log_instead_of_printing(self, temp_db, capsys, caplog):
+        """Test migration progress goes to the logger, never to stdout (the MCP stdio channel)"""
+        with caplog.at_level(logging.INFO, logger="lifecycle_mcp.migrations"):
+            apply_all_migrations(temp_db)
+
+        assert capsys.readouterr().out == ""
+        assert any("Applying migration" in record.getMessage() for record in caplog.records)
+
     def test_get_connection_context_manager(self, db_manager):
         """Test that get_connection works as context manager"""
         with db_manager.get_connection() as conn:
@@ -113,6 +261,52 @@ class TestDatabaseManager:
         count = db_manager.execute_query("SELECT COUNT(*) FROM requirements", fetch_one=True)
         assert count[0] == 3
 
+    def test_execute_many_chunks_non_durable(self, db_manager, monkeypatch):
+        """Test execute_many commits in windows and restores PRAGMAs after a non-durable load"""
+        monkeypatch.setattr(db_manager, "BULK_CHUNK_SIZE", 2)
+        params_list = [
+            [f"REQ-000{i}-FUNC-00", i, "FUNC", f"Test Requirement {i}", "P1", "Current", "Desired", "Test Author"]
+            for i in range(1, 6)
+        ]
+
+        db_manager.execute_many(
+            "INSERT INTO requirements (id, requirement_number, type, title, priority, "
+            "current_state, desired_state, author) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            params_list,
+            durable=False,
+        )
+
+        count = db_manager.execute_query("SELECT COUNT(*) FROM requirements", fetch_one=True)
+        assert count[0] == 5
+        with db_manager.get_connection(writable=True) as conn:
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+
+    def test_execute_many_joins_enclosing_transaction(self, db_manager, monkeypatch):
+        """Test execute_many inside transaction(writable=True) is rolled back with the outer block"""
+        monkeypatch.setattr(db_manager, "BULK_CHUNK_SIZE", 1)
+        insert = (
+            "INSERT INTO requirements (id, requirement_number, type, title, priority, "
+            "current_state, desired_state, author) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+        )
+        rows = [
+            [f"REQ-000{i}-FUNC-00", i, "FUNC", f"Test {i}", "P1", "Current", "Desired", "Author"] for i in (1, 2, 3)
+        ]
+
+        with pytest.raises(ValueError, match="Test error"), db_manager.transaction(writable=True) as cursor:
+            cursor.execute(insert, rows[0])
+            db_manager.execute_many(insert, rows[1:])
+            assert cursor.connection.in_transaction
+            raise ValueError("Test error")
+
+        assert db_manager.execute_query("SELECT COUNT(*) FROM requirements", fetch_one=True)[0] == 0
+
+        with pytest.raises(ValueError, match="durable"), db_manager.transaction(writable=True) as cursor:
+            cursor.execute(insert, rows[0])
+            db_manager.execute_many(insert, rows[1:], durable=False)
+
+        assert db_manager.execute_query("SELECT COUNT(*) FROM requirements", fetch_one=True)[0] == 0
+
     def test_transaction_success(self, db_manager):
         """Test successful transaction"""
         with db_manager.transaction() as cursor:
@@ -148,6 +342,25 @@ class TestDatabaseManager:
         )
         assert result is None
 
+    def test_nested_transaction_uses_savepoint(self, db_manager):
+        """Test a failing nested transaction only undoes its own work"""
+        insert = (
+            "INSERT INTO requirements (id, requirement_number, type, title, priority, "
+            "current_state, desired_state, author) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+        )
+
+        with db_manager.transaction(writable=True) as outer:
+            outer.execute(insert, ["REQ-0001-FUNC-00", 1, "FUNC", "Outer", "P1", "Current", "Desired", "Author"])
+
+            with pytest.raises(ValueError), db_manager.transaction(writable=True) as inner:
+                inner.execute(insert, ["REQ-0002-FUNC-00", 2, "FUNC", "Inner", "P1", "Current", "Desired", "Author"])
+                raise ValueError("Test error")
+
+            assert outer.connection.in_transaction
+
+        rows = db_manager.execute_query("SELECT id FROM requirements ORDER BY id", fetch_all=True)
+        assert [row[0] for row in rows] == ["REQ-0001-FUNC-00"]
+
     def test_get_next_id(self, db_manager):
         """Test get_next_id functionality"""
         # First ID should be 1
@@ -187,6 +400,68 @@ class TestDatabaseManager:
         next_id = db_manager.get_next_id("requirements", "requirement_number", "type = ?", ["TECH"])
         assert next_id == 2
 
+    def test_check_exists_many_stays_under_bound_parameter_limit(self, db_manager, monkeypatch):
+        """Test check_exists_many chunks inputs larger than SQLite's bound-parameter limit"""
+        monkeypatch.setattr(db_manager, "IN_CHUNK_SIZE", 4)
+        for number in (1, 9):
+            db_manager.insert_record(
+                "lifecycle_events", {"entity_type": "task", "entity_id": f"T-{number}", "event_type": "created"}
+            )
+        # This thread keeps the reader it borrows, so the lowered limit applies to the lookup
+        with db_manager.get_connection() as reader:
+            reader.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 4)
+
+        values = [f"T-{number}" for number in range(10)]
+        exists = db_manager.check_exists_many("lifecycle_events", "entity_id", values)
+
+        assert [value for value, found in zip(values, exists, strict=True) if found] == ["T-1", "T-9"]
+
+    def test_get_next_id_sees_uncommitted_rows_in_write_transaction(self, db_manager):
+        """Test get_next_id inside transaction(writable=True) counts the block's own inserts"""
+        with db_manager.transaction(writable=True):
+            db_manager.execute_query(
+                "INSERT INTO requirements (id, requirement_number, type, title, priority, "
+                "current_state, desired_state, author) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ["REQ-0001-FUNC-00", 1, "FUNC", "Test Requirement", "P1", "Current", "Desired", "Test Author"],
+            )
+
+            assert db_manager.get_next_id("requirements", "requirement_number", "type = ?", ["FUNC"]) == 2
+
+    def test_get_next_id_uses_index(self, db_manager):
+        """Test get_next_id is served from an index rather than a table scan"""
+        plan = db_manager.execute_query(
+            "EXPLAIN QUERY PLAN SELECT COALESCE(MAX(requirement_number), 0) + 1 FROM requirements WHERE type = ?",
+            ["FUNC"],
+            fetch_all=True,
+        )
+        assert any("idx_requirements_type_number" in row[3] for row in plan)
+
+    def test_get_records_in_chunks_keys(self, db_manager, monkeypatch):
+        """Test get_records_in maps rows by key across IN chunks and skips missing keys"""
+        monkeypatch.setattr(db_manager, "IN_CHUNK_SIZE", 2)
+        for number in range(1, 6):
+            db_manager.insert_record(
+                "lifecycle_events", {"entity_type": "task", "entity_id": f"T-{number}", "event_type": "created"}
+            )
+
+        found = db_manager.get_records_in(
+            "lifecycle_events", "entity_id, event_type", "entity_id", ["T-5", "T-1", "T-9", "T-3", "T-1"]
+        )
+
+        assert sorted(found) == ["T-1", "T-3", "T-5"]
+        assert found["T-5"]["event_type"] == "created"
+
+    def test_rows_to_dicts(self, db_manager):
+        """Test rows_to_dicts converts rows using the column names of the result"""
+        db_manager.insert_record(
+            "lifecycle_events", {"entity_type": "task", "entity_id": "T-1", "event_type": "created"}
+        )
+        rows = db_manager.execute_query("SELECT entity_id, event_type FROM lifecycle_events", fetch_all=True)
+
+        assert DatabaseManager.rows_to_dicts(rows) == [{"entity_id": "T-1", "event_type": "created"}]
+        assert DatabaseManager.rows_to_dicts([]) == []
+        assert DatabaseManager.rows_to_dicts([{"a": 1}]) == [{"a": 1}]
+
     def test_check_exists(self, db_manager):
         """Test check_exists functionality"""
         # Should not exist initially
@@ -204,6 +479,26 @@ class TestDatabaseManager:
         exists = db_manager.check_exists("requirements", "id = ?", ["REQ-0001-FUNC-00"])
         assert exists
 
+    def test_check_exists_many(self, db_manager):
+        """Test check_exists_many reports existence for each value in order"""
+        db_manager.insert_record(
+            "requirements",
+            {
+                "id": "REQ-0001-FUNC-00",
+                "requirement_number": 1,
+                "type": "FUNC",
+                "title": "Test Requirement",
+                "priority": "P1",
+                "current_state": "Current",
+                "desired_state": "Desired",
+                "author": "Test Author",
+            },
+        )
+
+        exists = db_manager.check_exists_many("requirements", "id", ["REQ-0002-FUNC-00", "REQ-0001-FUNC-00"])
+        assert exists == [False, True]
+        assert db_manager.check_exists_many("requirements", "id", []) == []
+
     def test_insert_record(self, db_manager):
         """Test insert_record helper method"""
         data = {
@@ -281,3 +576,210 @@ class TestDatabaseManager:
         # Get limited records
         records = db_manager.get_records("requirements", "id, title", "type = ?", ["FUNC"], "priority", limit=2)
         assert len(records) == 2
+
+    def test_writable_connection_is_dedicated_writer(self, db_manager):
+        """Test that writable connections share the single writer connection"""
+        with db_manager.get_connection(writable=True) as writer:
+            first = writer
+        with db_manager.get_connection(writable=True) as writer:
+            assert writer is first
+        with db_manager.get_connection() as reader:
+            assert reader is not first
+
+    def test_generated_sql_is_interned(self):
+        """Test repeated query shapes hand the same SQL object to the statement cache"""
+        first = _build_insert_sql("tasks", ("id", "title"))
+        _build_insert_sql.cache_clear()
+        assert _build_insert_sql("tasks", ("id", "title")) is first
+
+    def test_delete_record_reuses_cached_sql(self, db_manager):
+        """Test delete_record removes matching rows through the cached DELETE template"""
+        for entity_id in ("T-1", "T-2"):
+            db_manager.insert_record(
+                "lifecycle_events", {"entity_type": "task", "entity_id": entity_id, "event_type": "created"}
+            )
+        _build_delete_sql.cache_clear()
+
+        db_manager.delete_record("lifecycle_events", "entity_id = ?", ["T-1"])
+        db_manager.delete_record("lifecycle_events", "entity_id = ?", ["T-2"])
+
+        assert db_manager.get_records("lifecycle_events") == []
+        assert _build_delete_sql.cache_info().hits == 1
+
+    def test_register_insert(self, db_manager):
+        """Test registered insert shapes are used regardless of key order"""
+        db_manager.register_insert("lifecycle_events", ("entity_type", "entity_id", "event_type", "actor"))
+
+        db_manager.insert_record(
+            "lifecycle_events",
+            {"actor": "Tester", "event_type": "created", "entity_id": "TASK-0001-00-00", "entity_type": "task"},
+        )
+        # A different column set falls back to the generic path
+        db_manager.insert_record(
+            "lifecycle_events", {"entity_type": "task", "entity_id": "TASK-0002-00-00", "event_type": "created"}
+        )
+
+        rows = db_manager.execute_query(
+            "SELECT entity_id, actor FROM lifecycle_events ORDER BY entity_id", fetch_all=True
+        )
+        assert [tuple(row) for row in rows] == [("TASK-0001-00-00", "Tester"), ("TASK-0002-00-00", None)]
+
+    def test_insert_many(self, db_manager):
+        """Test insert_many inserts all rows in one batch"""
+        rows = [
+            {
+                "id": f"REQ-000{i + 1}-FUNC-00",
+                "requirement_number": i + 1,
+                "type": "FUNC",
+                "title": f"Test Requirement {i + 1}",
+                "priority": "P1",
+                "current_state": "Current",
+                "desired_state": "Desired",
+                "author": "Test Author",
+            }
+            for i in range(3)
+        ]
+
+        db_manager.insert_many("requirements", rows)
+
+        count = db_manager.execute_query("SELECT COUNT(*) FROM requirements", fetch_one=True)
+        assert count[0] == 3
+
+    def test_insert_many_rejects_mismatched_keys(self, db_manager):
+        """Test insert_many refuses rows with differing keys instead of dropping or failing midway"""
+        first = {"entity_type": "task", "entity_id": "T-1", "event_type": "created"}
+
+        with pytest.raises(ValueError, match="same keys"):
+            db_manager.insert_many("lifecycle_events", [first, {**first, "entity_id": "T-2", "actor": "Tester"}])
+        with pytest.raises(ValueError, match="same keys"):
+            db_manager.insert_many("lifecycle_events", [first, {"entity_type": "task", "entity_id": "T-3"}])
+
+        assert db_manager.get_records("lifecycle_events") == []
+
+    def test_execute_query_without_commit_inside_transaction(self, db_manager):
+        """Test that commit=False writes are committed by the enclosing transaction"""
+        with db_manager.transaction(writable=True):
+            db_manager.execute_query(
+                "INSERT INTO requirements (id, requirement_number, type, title, priority, "
+                "current_state, desired_state, author) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ["REQ-0001-FUNC-00", 1, "FUNC", "Test Requirement", "P1", "Current", "Desired", "Test Author"],
+                commit=False,
+            )
+
+        result = db_manager.execute_query(
+            "SELECT id FROM requirements WHERE id = ?", ["REQ-0001-FUNC-00"], fetch_one=True
+        )
+        assert result is not None
+
+    def test_execute_query_without_commit_outside_transaction_is_rejected(self, db_manager):
+        """Test that a standalone commit=False write is refused instead of leaving the writer mid-transaction"""
+        with pytest.raises(ValueError, match="commit=False"):
+            db_manager.execute_query(
+                "INSERT INTO lifecycle_events (entity_type, entity_id, event_type) VALUES (?, ?, ?)",
+                ["task", "T-1", "created"],
+                commit=False,
+            )
+
+        db_manager.insert_record(
+            "lifecycle_events", {"entity_type": "task", "entity_id": "T-2", "event_type": "created"}
+        )
+        with db_manager.get_connection(writable=True) as conn:
+            assert not conn.in_transaction
+        rows = db_manager.execute_query("SELECT entity_id FROM lifecycle_events", fetch_all=True)
+        assert [row[0] for row in rows] == ["T-2"]
+
+    def test_execute_query_joins_outer_transaction(self, db_manager):
+        """Test writes inside transaction(writable=True) are rolled back with it and failures do not end it"""
+        insert = (
+            "INSERT INTO requirements (id, requirement_number, type, title, priority, "
+            "current_state, desired_state, author) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+        )
+        row = ["REQ-0001-FUNC-00", 1, "FUNC", "Test Requirement", "P1", "Current", "Desired", "Test Author"]
+
+        with pytest.raises(ValueError), db_manager.transaction(writable=True) as cursor:
+            db_manager.execute_query(insert, row)
+            with pytest.raises(sqlite3.IntegrityError):
+                db_manager.execute_query(insert, row)
+            assert cursor.connection.in_transaction
+            raise ValueError("Test error")
+
+        assert db_manager.execute_query("SELECT COUNT(*) FROM requirements", fetch_one=True)[0] == 0
+
+    def test_closed_pooled_connection_is_replaced(self, db_manager):
+        """Test that a connection closed underneath the pool is rebuilt on failure"""
+        with db_manager.get_connection() as conn:
+            broken = conn
+        broken.close()
+
+        # Drain the pool until the broken connection is borrowed and fails
+        with pytest.raises(sqlite3.ProgrammingError):
+            for _ in range(db_manager.pool_size):
+                with db_manager.get_connection() as conn:
+                    conn.execute("SELECT 1")
+
+        assert broken not in db_manager.connection_pool.all_connections
+        result = db_manager.execute_query("SELECT 1", fetch_one=True)
+        assert result[0] == 1
+
+    def test_pool_runs_optimize_periodically(self, db_manager, monkeypatch):
+        """Test that returned connections run PRAGMA optimize every OPTIMIZE_INTERVAL returns"""
+        pool = db_manager.connection_pool
+        monkeypatch.setattr(pool, "OPTIMIZE_INTERVAL", 2)
+
+        statements = []
+        for conn in pool.pool:
+            conn.set_trace_callback(statements.append)
+
+        # The idle pool is FIFO, so each connection is returned once per round
+        for _ in range(pool.pool_size):
+            pool.return_connection(pool.get_connection())
+        assert "PRAGMA optimize" not in statements
+
+        for _ in range(pool.pool_size):
+            pool.return_connection(pool.get_connection())
+        assert statements.count("PRAGMA optimize") == pool.pool_size
+        assert set(pool.return_counts.values()) == {2}
+
+    def test_reader_connection_is_bound_per_thread(self, db_manager):
+        """Test that a thread reuses its reader and hands it back when the thread ends"""
+        with db_manager.get_connection() as first:
+            pass
+        with db_manager.get_connection() as second:
+            assert second is first
+
+        borrowed = []
+
+        def worker():
+            with db_manager.get_connection() as conn:
+                borrowed.append(conn)
+
+        available_before = len(db_manager.connection_pool.pool)
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        gc.collect()
+
+        assert borrowed[0] is not first
+        assert len(db_manager.connection_pool.pool) == available_before
+
+    def test_iter_records_streams_in_batches(self, db_manager):
+        """Test iter_records yields every row across several fetch batches"""
+        db_manager.insert_many(
+            "requirements",
+            [
+                {
+                    "id": f"REQ-{i + 1:04d}-FUNC-00",
+                    "requirement_number": i + 1,
+                    "type": "FUNC",
+                    "title": f"Test Requirement {i + 1}",
+                    "priority": "P1",
+                    "current_state": "Current",
+                    "desired_state": "Desired",
+                    "author": "Test Author",
+                }
+                for i in range(5)
+            ],
+        )
+
+        records = db_manager.iter_records("requirements", "id", order_by="requirement_number", batch_size=2)
+        assert [row["id"] for row in records] == [f"REQ-{i + 1:04d}-FUNC-00" for i in range(5)]
@@ -375,6 +375,18 @@ class TestMCPServerIntegration:
             assert tool_name in server.handlers
             assert server.handlers[tool_name] == expected_handler
 
+    @pytest.mark.asyncio
+    async def test_list_tools_builds_tools_once(self, server_instance):
+        """Test that list_tools reuses the Tool objects built on the first call"""
+        from mcp.types import ListToolsRequest
+
+        list_tools = server_instance.server.request_handlers[ListToolsRequest]
+        first = await list_tools(ListToolsRequest(method="tools/list"))
+        second = await list_tools(ListToolsRequest(method="tools/list"))
+
+        assert len(first.root.tools) == len(server_instance.handlers)
+        assert all(a is b for a, b in zip(first.root.tools, second.root.tools, strict=True))
+
     @pytest.mark.asyncio
     async def test_error_handling_integration(self, server_instance):
         """Test error handling across the integrated system"""
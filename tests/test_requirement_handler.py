@@ -2,6 +2,10 @@
 Unit tests for RequirementHandler
 """
 
+import asyncio
+import logging
+import threading
+
 import pytest
 
 
@@ -25,6 +29,9 @@ class TestRequirementHandler:
         ]
         assert all(tool in tool_names for tool in expected_tools)
 
+        # Definitions are static and built once
+        assert requirement_handler.get_tool_definitions() is tools
+
     @pytest.mark.asyncio
     async def test_create_requirement_success(self, requirement_handler, sample_requirement_data):
         """Test successful requirement creation"""
@@ -40,6 +47,28 @@ class TestRequirementHandler:
         assert records[0]["type"] == "FUNC"
         assert records[0]["priority"] == "P1"
 
+    def test_concurrent_creates_get_distinct_numbers(self, requirement_handler, sample_requirement_data):
+        """Test requirements created from several threads never share a number"""
+        errors = []
+
+        def create():
+            try:
+                requirement_handler._create_single_requirement(sample_requirement_data)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=create) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        records = requirement_handler.db.get_records(
+            "requirements", "requirement_number", order_by="requirement_number"
+        )
+        assert [record["requirement_number"] for record in records] == list(range(1, 9))
+
     @pytest.mark.asyncio
     async def test_create_requirement_missing_params(self, requirement_handler):
         """Test requirement creation with missing required parameters"""
@@ -117,6 +146,20 @@ class TestRequirementHandler:
         assert "REQ-0002-FUNC-00" in result[0].text
         assert "REQ-0003-FUNC-00" in result[0].text
 
+    @pytest.mark.asyncio
+    async def test_query_requirements_paging(self, requirement_handler, sample_requirement_data):
+        """Test limit/offset paging of query results"""
+        for i in range(3):
+            data = sample_requirement_data.copy()
+            data["title"] = f"Test Requirement {i + 1}"
+            await requirement_handler._create_requirement(**data)
+
+        result = requirement_handler._query_requirements(limit=2)
+        assert "2 requirement" in result[0].text
+
+        result = requirement_handler._query_requirements(offset=2)
+        assert "1 requirement" in result[0].text
+
     @pytest.mark.asyncio
     async def test_query_requirements_with_filters(self, requirement_handler, sample_requirement_data):
         """Test querying requirements with filters"""
@@ -190,6 +233,82 @@ class TestRequirementHandler:
         assert "Desired test state" in details
         assert "Test business value" in details
 
+    @pytest.mark.asyncio
+    async def test_get_requirement_details_cache_invalidated_on_status_change(
+        self, requirement_handler, sample_requirement_data
+    ):
+        """Test cached details are reused but refreshed after a status update"""
+        await requirement_handler._create_requirement(**sample_requirement_data)
+
+        first = requirement_handler._get_requirement_details(requirement_id="REQ-0001-FUNC-00")
+        second = requirement_handler._get_requirement_details(requirement_id="REQ-0001-FUNC-00")
+        assert first[0].text == second[0].text
+        assert "REQ-0001-FUNC-00" in requirement_handler._detail_cache
+
+        await requirement_handler._update_requirement_status(
+            requirement_id="REQ-0001-FUNC-00", new_status="Under Review"
+        )
+        result = requirement_handler._get_requirement_details(requirement_id="REQ-0001-FUNC-00")
+        assert "**Status**: Under Review" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_create_decomposed_requirements(self, requirement_handler, sample_requirement_data):
+        """Test decomposition writes parent, children and links in one transaction"""
+        analysis = {
+            "decomposition": {
+                "suggested_sub_requirements": [
+                    {"title": "Sub A", "rationale": "first"},
+                    {"title": "Sub B", "type": "TECH", "rationale": "second"},
+                    {"title": "Sub C", "rationale": "third"},
+                ]
+            }
+        }
+
+        result = await requirement_handler._create_decomposed_requirements(analysis, sample_requirement_data)
+        assert "3 sub-requirements" in result[0].text
+
+        ids = [row["id"] for row in requirement_handler.db.get_records("requirements", "id", order_by="id")]
+        assert ids == ["REQ-0001-FUNC-00", "REQ-0001-TECH-00", "REQ-0002-FUNC-00", "REQ-0003-FUNC-00"]
+
+        links = requirement_handler.db.execute_query(
+            "SELECT COUNT(*) FROM requirement_dependencies WHERE depends_on_requirement_id = ?",
+            ["REQ-0001-FUNC-00"],
+            fetch_one=True,
+        )
+        assert links[0] == 3
+
+        events = requirement_handler.db.execute_query(
+            "SELECT entity_type, COUNT(*) FROM lifecycle_events WHERE event_type != 'status_change' "
+            "GROUP BY entity_type ORDER BY entity_type",
+            fetch_all=True,
+        )
+        assert [tuple(row) for row in events] == [("requirement", 4), ("requirement_dependency", 3)]
+
+    @pytest.mark.asyncio
+    async def test_trace_requirement_decomposition(self, requirement_handler, sample_requirement_data):
+        """Test tracing reports children of a parent and the parent of a child"""
+        analysis = {
+            "decomposition": {
+                "suggested_sub_requirements": [
+                    {"title": "Sub A", "rationale": "first"},
+                    {"title": "Sub B", "rationale": "second"},
+                ]
+            }
+        }
+        await requirement_handler._create_decomposed_requirements(analysis, sample_requirement_data)
+
+        parent_trace = requirement_handler._trace_requirement(requirement_id="REQ-0001-FUNC-00")[0].text
+        assert "## Child Requirements (2)" in parent_trace
+        assert parent_trace.index("REQ-0002-FUNC-00") < parent_trace.index("REQ-0003-FUNC-00")
+        assert "Parent to 2 children" in parent_trace
+
+        child_trace = requirement_handler._trace_requirement(requirement_id="REQ-0002-FUNC-00")[0].text
+        assert "## Parent Requirements (1)" in child_trace
+        assert "Child of 1 parent(s)" in child_trace
+
+        missing = requirement_handler._trace_requirement(requirement_id="REQ-9999-FUNC-00")[0].text
+        assert "Requirement not found" in missing
+
     def test_get_requirement_details_not_found(self, requirement_handler):
         """Test getting details for non-existent requirement"""
         result = requirement_handler._get_requirement_details(requirement_id="REQ-9999-FUNC-00")
@@ -235,6 +354,125 @@ class TestRequirementHandler:
         assert "ERROR" in result[0].text  # Check for above-fold format
         assert "Unknown tool: unknown_tool" in result[0].text
 
+    @pytest.mark.asyncio
+    async def test_llm_analysis_is_cached(self, requirement_handler, sample_requirement_data, mocker):
+        """Test that resubmitting the same requirement reuses the earlier LLM analysis"""
+        response = mocker.Mock()
+        response.content.text = '{"recommendation": "create_single"}'
+        requirement_handler.mcp_client = mocker.Mock(spec=["sample"])
+        requirement_handler.mcp_client.sample = mocker.AsyncMock(return_value=response)
+        requirement_handler._testing_mode = False
+
+        first = await requirement_handler._analyze_requirement_with_llm(sample_requirement_data)
+        reworded = {**sample_requirement_data, "title": sample_requirement_data["title"].upper() + "  "}
+        second = await requirement_handler._analyze_requirement_with_llm(reworded)
+
+        assert first == second == {"recommendation": "create_single"}
+        requirement_handler.mcp_client.sample.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_llm_analysis_is_persisted(self, requirement_handler, sample_requirement_data, mocker):
+        """Test that an analysis stored by one handler is reused by a fresh one without sampling"""
+        from lifecycle_mcp.handlers import RequirementHandler
+
+        response = mocker.Mock()
+        response.content.text = '{"recommendation": "create_single"}'
+        requirement_handler.mcp_client = mocker.Mock(spec=["sample"])
+        requirement_handler.mcp_client.sample = mocker.AsyncMock(return_value=response)
+        requirement_handler._testing_mode = False
+        await requirement_handler._analyze_requirement_with_llm(sample_requirement_data)
+
+        restarted = RequirementHandler(requirement_handler.db, mocker.Mock(spec=["sample"]))
+        restarted.mcp_client.sample = mocker.AsyncMock()
+
+        analysis = await restarted._analyze_requirement_with_llm(sample_requirement_data)
+
+        assert analysis == {"recommendation": "create_single"}
+        restarted.mcp_client.sample.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_trivial_requirement_skips_llm_analysis(self, requirement_handler, mocker):
+        """Test that short single-feature requirements are created without LLM analysis"""
+        requirement_handler.mcp_client = mocker.Mock(spec=["sample"])
+        requirement_handler.mcp_client.sample = mocker.AsyncMock()
+        requirement_handler._testing_mode = False
+
+        result = await requirement_handler._create_requirement(
+            type="FUNC",
+            title="Natural language search",
+            priority="P1",
+            current_state="Keyword search only",
+            desired_state="Users can search in plain English",
+        )
+
+        assert "REQ-0001-FUNC-00" in result[0].text
+        assert "LLM analysis not available" not in result[0].text
+        requirement_handler.mcp_client.sample.assert_not_called()
+        assert not requirement_handler._is_trivially_single(
+            {
+                "title": "Search and navigation",
+                "current_state": "Keyword search only",
+                "desired_state": "Users can search in plain English",
+            }
+        )
+
+    @pytest.mark.asyncio
+    async def test_llm_analysis_stops_streaming_once_json_is_complete(
+        self, requirement_handler, sample_requirement_data, mocker
+    ):
+        """Test that a streamed analysis is parsed as soon as the JSON object closes"""
+        consumed = []
+
+        async def sample_stream(_request):
+            for chunk in ['{"recommendation": ', '"needs_clarification"}', " trailing text", " never read"]:
+                consumed.append(chunk)
+                yield chunk
+
+        requirement_handler.mcp_client = mocker.Mock(spec=["sample_stream"])
+        requirement_handler.mcp_client.sample_stream = sample_stream
+        requirement_handler._testing_mode = False
+
+        analysis = await requirement_handler._analyze_requirement_with_llm(sample_requirement_data)
+
+        assert analysis == {"recommendation": "needs_clarification"}
+        assert len(consumed) == 2
+
+    def test_incomplete_tasks_query_uses_keys(self, requirement_handler):
+        """Test that the validation pre-check seeks by key instead of scanning tasks"""
+        from lifecycle_mcp.handlers.requirement_handler import _INCOMPLETE_TASKS_SQL
+
+        plan = requirement_handler.db.execute_query(
+            f"EXPLAIN QUERY PLAN {_INCOMPLETE_TASKS_SQL}", ["REQ-0001-FUNC-00"], fetch_all=True
+        )
+        assert all(row[3].startswith("SEARCH") for row in plan)
+
+    def test_trace_query_uses_keys(self, requirement_handler):
+        """Test that the trace query finds children through an index instead of scanning dependencies"""
+        from lifecycle_mcp.handlers.requirement_handler import _TRACE_SQL
+
+        plan = requirement_handler.db.execute_query(
+            f"EXPLAIN QUERY PLAN {_TRACE_SQL}", {"requirement_id": "REQ-0001-FUNC-00"}, fetch_all=True
+        )
+        assert not any(row[3].startswith("SCAN") for row in plan)
+
+    @pytest.mark.asyncio
+    async def test_sync_tools_run_off_event_loop(self, requirement_handler):
+        """Test that blocking tool methods are executed in a worker thread"""
+        requirement_handler._dispatch["query_requirements"] = (lambda **_: threading.get_ident(), False)
+
+        worker_thread = await requirement_handler.handle_tool_call("query_requirements", {})
+        assert worker_thread != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sync_tools_do_not_exhaust_reader_pool(self, requirement_handler, caplog):
+        """Test that concurrent blocking tools run on workers that each keep a pooled reader"""
+        with caplog.at_level(logging.WARNING, logger="lifecycle_mcp.database_manager"):
+            await asyncio.gather(*(requirement_handler.handle_tool_call("query_requirements", {}) for _ in range(12)))
+            requirement_handler.db.execute_query("SELECT 1", fetch_one=True)
+
+        assert not [record for record in caplog.records if "pool exhausted" in record.getMessage()]
+        assert requirement_handler.db.executor._max_workers < requirement_handler.db.pool_size
+
     @pytest.mark.asyncio
     async def test_functional_requirements_json_handling(self, requirement_handler, sample_requirement_data):
         """Test that functional requirements are properly serialized and deserialized"""